@@ -0,0 +1,92 @@
+import os
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from fastapi import Request
+
+
+# Deadline (ms) theo nhóm route, khớp theo prefix; route không khớp dùng REQUEST_DEADLINE_DEFAULT_MS
+REQUEST_DEADLINE_DEFAULT_MS = int(os.getenv("REQUEST_DEADLINE_DEFAULT_MS", "5000"))
+ROUTE_DEADLINES_MS = {
+    "/media": int(os.getenv("REQUEST_DEADLINE_MEDIA_MS", "10000")),
+    "/search": int(os.getenv("REQUEST_DEADLINE_SEARCH_MS", "3000")),
+    "/admin": int(os.getenv("REQUEST_DEADLINE_ADMIN_MS", "10000")),
+}
+# Route không có deadline tổng (vd upload: thời gian phụ thuộc kích thước body, deadline sẽ hết
+# trước khi handler kịp chạy); mỗi thao tác DB nhận budget riêng REQUEST_DEADLINE_DEFAULT_MS
+DEADLINE_EXEMPT_ROUTES = {("POST", "/media")}
+# Budget cho mỗi lần ghi chunk vào GridFS khi upload
+MEDIA_WRITE_DEADLINE_MS = int(os.getenv("MEDIA_WRITE_DEADLINE_MS", "10000"))
+REQUEST_DEADLINE_RETRY_AFTER_SECONDS = int(os.getenv("REQUEST_DEADLINE_RETRY_AFTER_SECONDS", "1"))
+
+_request_deadline: ContextVar[Optional[float]] = ContextVar("request_deadline", default=None)
+_operation_budget_ms: ContextVar[Optional[int]] = ContextVar("operation_budget_ms", default=None)
+
+# Số request bị hết deadline theo từng route
+timeout_counter: Counter = Counter()
+
+
+def deadline_ms_for_request(method: str, path: str) -> Optional[int]:
+
+    if (method, path.rstrip("/")) in DEADLINE_EXEMPT_ROUTES:
+        return None
+    for prefix, deadline_ms in ROUTE_DEADLINES_MS.items():
+        if path == prefix or path.startswith(prefix + "/"):
+            return deadline_ms
+    return REQUEST_DEADLINE_DEFAULT_MS
+
+
+def remaining_seconds() -> Optional[float]:
+    """
+    Thời gian còn lại cho thao tác DB hiện tại:
+    deadline của request/deadline_scope, hoặc budget theo từng thao tác với route được miễn,
+    None nếu không có (vd task nền)
+    """
+    deadline = _request_deadline.get()
+    if deadline is None:
+        budget_ms = _operation_budget_ms.get()
+        return budget_ms / 1000 if budget_ms is not None else None
+    return deadline - time.monotonic()
+
+
+@contextmanager
+def deadline_scope(milliseconds: int, detached: bool = False):
+    """
+    Đặt deadline cho một nhóm thao tác (không vượt quá deadline hiện có của request)
+    detached=True: budget riêng, bỏ qua deadline của request (dùng cho bước phải hoàn tất
+    sau khi dữ liệu chính đã được ghi)
+    """
+    deadline = time.monotonic() + milliseconds / 1000
+    current = _request_deadline.get()
+    if current is not None and not detached:
+        deadline = min(deadline, current)
+    token = _request_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _request_deadline.reset(token)
+
+
+def record_timeout(request: Request) -> None:
+
+    route = request.scope.get("route")
+    timeout_counter[getattr(route, "path", request.url.path)] += 1
+
+
+async def deadline_middleware(request: Request, call_next):
+    """Middleware: đặt deadline cho request theo nhóm route"""
+    deadline_ms = deadline_ms_for_request(request.method, request.url.path)
+    if deadline_ms is None:
+        token = _operation_budget_ms.set(REQUEST_DEADLINE_DEFAULT_MS)
+        try:
+            return await call_next(request)
+        finally:
+            _operation_budget_ms.reset(token)
+    token = _request_deadline.set(time.monotonic() + deadline_ms / 1000)
+    try:
+        return await call_next(request)
+    finally:
+        _request_deadline.reset(token)
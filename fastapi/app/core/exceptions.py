@@ -0,0 +1,2 @@
+class DeadlineExceeded(Exception):
+    """Request đã dùng hết thời gian cho phép (deadline) trước khi thao tác DB hoàn tất"""
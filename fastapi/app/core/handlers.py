@@ -0,0 +1,15 @@
+from fastapi import Request, status
+from fastapi.responses import JSONResponse
+
+from app.core.deadline import REQUEST_DEADLINE_RETRY_AFTER_SECONDS, record_timeout
+from app.core.exceptions import DeadlineExceeded
+
+
+async def deadline_exceeded_handler(request: Request, exc: DeadlineExceeded) -> JSONResponse:
+    """Hết deadline: trả 503 ngay kèm Retry-After thay vì treo request"""
+    record_timeout(request)
+    return JSONResponse(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        content={"detail": "Service temporarily unavailable, please retry."},
+        headers={"Retry-After": str(REQUEST_DEADLINE_RETRY_AFTER_SECONDS)}
+    )
@@ -7,6 +7,9 @@ from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase
 
 load_dotenv()
 
+# "mongo" (mặc định) hoặc "memory" (engine in-memory cho user/friend, không cần mongod)
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "mongo").lower()
+
 _mongo_client: Optional[AsyncIOMotorClient] = None
 _mongo_db: Optional[AsyncIOMotorDatabase] = None
 
@@ -43,8 +46,8 @@ async def connect_to_mongo() -> None:
     try:
         _mongo_client = AsyncIOMotorClient(
             uri,
-            serverSelectionTimeoutMS=30000,
-            connectTimeoutMS=30000,
+            serverSelectionTimeoutMS=int(os.getenv("MONGODB_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+            connectTimeoutMS=int(os.getenv("MONGODB_CONNECT_TIMEOUT_MS", "10000")),
             tlsAllowInvalidCertificates=True  # Bỏ qua lỗi SSL certificate trên Windows
         )
     except Exception as e:
@@ -0,0 +1,106 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+import pymongo
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import PyMongoError
+
+from app.core.deadline import remaining_seconds
+from app.core.exceptions import DeadlineExceeded
+
+
+async def with_deadline(operation: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Chạy một thao tác Motor trong deadline của request hiện tại:
+    - pymongo.timeout() (CSOT) tự gán maxTimeMS và giới hạn server selection / socket
+    - asyncio.wait_for chặn phía client nếu driver không trả về kịp
+    """
+    remaining = remaining_seconds()
+    if remaining is None:
+        return await operation()
+    if remaining <= 0:
+        raise DeadlineExceeded()
+    try:
+        with pymongo.timeout(remaining):
+            return await asyncio.wait_for(operation(), remaining)
+    except asyncio.TimeoutError as exc:
+        raise DeadlineExceeded() from exc
+    except PyMongoError as exc:
+        if exc.timeout:
+            raise DeadlineExceeded() from exc
+        raise
+
+
+class DeadlineCursor:
+    """Bọc AsyncIOMotorCursor: gán max_time_ms và áp deadline cho từng lần fetch"""
+
+    def __init__(self, cursor) -> None:
+        self._cursor = cursor
+        remaining = remaining_seconds()
+        if remaining is not None:
+            if remaining <= 0:
+                raise DeadlineExceeded()
+            self._cursor.max_time_ms(max(int(remaining * 1000), 1))
+
+    def sort(self, *args, **kwargs) -> "DeadlineCursor":
+
+        self._cursor.sort(*args, **kwargs)
+        return self
+
+    def limit(self, *args, **kwargs) -> "DeadlineCursor":
+
+        self._cursor.limit(*args, **kwargs)
+        return self
+
+    def skip(self, *args, **kwargs) -> "DeadlineCursor":
+
+        self._cursor.skip(*args, **kwargs)
+        return self
+
+    def __aiter__(self) -> "DeadlineCursor":
+
+        return self
+
+    async def __anext__(self) -> Any:
+
+        return await with_deadline(self._cursor.__anext__)
+
+    async def to_list(self, length: Optional[int] = None) -> list:
+
+        return await with_deadline(lambda: self._cursor.to_list(length))
+
+
+def _deadline_method(name: str):
+
+    async def method(self, *args, **kwargs):
+        operation = getattr(self._collection, name)
+        return await with_deadline(lambda: operation(*args, **kwargs))
+
+    method.__name__ = name
+    return method
+
+
+class DeadlineCollection:
+    """
+    Bọc AsyncIOMotorCollection cho repository: mọi thao tác đều chịu deadline của request
+    (ngoài request, vd task nền, thì chạy như collection thường)
+    """
+
+    def __init__(self, collection: AsyncIOMotorCollection) -> None:
+        self._collection = collection
+
+    def find(self, *args, **kwargs) -> DeadlineCursor:
+
+        return DeadlineCursor(self._collection.find(*args, **kwargs))
+
+    find_one = _deadline_method("find_one")
+    find_one_and_update = _deadline_method("find_one_and_update")
+    insert_one = _deadline_method("insert_one")
+    insert_many = _deadline_method("insert_many")
+    update_one = _deadline_method("update_one")
+    update_many = _deadline_method("update_many")
+    delete_one = _deadline_method("delete_one")
+    delete_many = _deadline_method("delete_many")
+    bulk_write = _deadline_method("bulk_write")
+    count_documents = _deadline_method("count_documents")
+    create_index = _deadline_method("create_index")
@@ -0,0 +1,164 @@
+import bisect
+import copy
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from bson import ObjectId
+
+
+class InMemoryTable:
+    """
+    Bảng in-memory: dict theo _id, index băm (dict) cho truy vấn bằng và
+    index sắp xếp (list + bisect) cho truy vấn theo khoảng.
+    """
+
+    def __init__(self, indexes: Iterable[Tuple[str, ...]] = (), sorted_indexes: Iterable[str] = (), unique: Iterable[Tuple[str, ...]] = ()) -> None:
+        self._rows: Dict[str, dict] = {}
+        self._unique = set(unique)
+        self._hash_indexes: Dict[Tuple[str, ...], Dict[tuple, set]] = {
+            fields: {} for fields in (*indexes, *self._unique)
+        }
+        self._sorted_indexes: Dict[str, List[tuple]] = {field: [] for field in sorted_indexes}
+
+    def __len__(self) -> int:
+
+        return len(self._rows)
+
+    def _key(self, fields: Tuple[str, ...], doc: dict) -> tuple:
+
+        return tuple(doc.get(field) for field in fields)
+
+    def _index(self, row_id: str, doc: dict) -> None:
+
+        for fields, index in self._hash_indexes.items():
+            index.setdefault(self._key(fields, doc), set()).add(row_id)
+        for field, entries in self._sorted_indexes.items():
+            if doc.get(field) is not None:
+                bisect.insort(entries, (doc[field], row_id))
+
+    def _unindex(self, row_id: str, doc: dict) -> None:
+
+        for fields, index in self._hash_indexes.items():
+            key = self._key(fields, doc)
+            ids = index.get(key)
+            if ids is not None:
+                ids.discard(row_id)
+                if not ids:
+                    del index[key]
+        for field, entries in self._sorted_indexes.items():
+            if doc.get(field) is not None:
+                position = bisect.bisect_left(entries, (doc[field], row_id))
+                if position < len(entries) and entries[position] == (doc[field], row_id):
+                    del entries[position]
+
+    def _check_unique(self, doc: dict, row_id: Optional[str] = None) -> None:
+
+        for fields in self._unique:
+            existing = self._hash_indexes[fields].get(self._key(fields, doc), set()) - {row_id}
+            if existing:
+                raise ValueError(f"Duplicate key for {fields}")
+
+    def insert(self, doc: dict) -> str:
+
+        row = copy.deepcopy(doc)
+        row_id = str(row.get("_id") or ObjectId())
+        row["_id"] = row_id
+        self._check_unique(row)
+        self._rows[row_id] = row
+        self._index(row_id, row)
+        return row_id
+
+    def get(self, row_id: str) -> Optional[dict]:
+
+        row = self._rows.get(row_id)
+        return copy.deepcopy(row) if row is not None else None
+
+    def find(self, **criteria: Any) -> List[dict]:
+        """Truy vấn bằng; dùng index băm nếu có index khớp đúng các field"""
+        if "_id" in criteria:
+            row = self._rows.get(criteria["_id"])
+            candidates = [row] if row is not None else []
+        else:
+            key = next((fields for fields in self._hash_indexes if set(fields) == set(criteria)), None)
+            if key is not None:
+                ids = self._hash_indexes[key].get(tuple(criteria[field] for field in key), set())
+                candidates = [self._rows[row_id] for row_id in ids]
+            else:
+                candidates = list(self._rows.values())
+        return [
+            copy.deepcopy(row) for row in candidates
+            if all(row.get(field) == value for field, value in criteria.items())
+        ]
+
+    def find_one(self, **criteria: Any) -> Optional[dict]:
+
+        rows = self.find(**criteria)
+        return rows[0] if rows else None
+
+    def all(self) -> List[dict]:
+
+        return [copy.deepcopy(row) for row in self._rows.values()]
+
+    def range(self, field: str, upper: Any) -> List[str]:
+        """Các _id có giá trị field <= upper (dùng index sắp xếp)"""
+        entries = self._sorted_indexes[field]
+        position = bisect.bisect_right(entries, (upper, chr(0x10FFFF)))
+        return [row_id for _, row_id in entries[:position]]
+
+    def update(self, row_id: str, changes: dict) -> bool:
+
+        row = self._rows.get(row_id)
+        if row is None:
+            return False
+        updated = {**row, **copy.deepcopy(changes)}
+        if updated == row:
+            return False
+        self._check_unique(updated, row_id)
+        self._unindex(row_id, row)
+        self._rows[row_id] = updated
+        self._index(row_id, updated)
+        return True
+
+    def delete(self, row_id: str) -> bool:
+
+        row = self._rows.pop(row_id, None)
+        if row is None:
+            return False
+        self._unindex(row_id, row)
+        return True
+
+
+class InMemoryStore:
+    """Engine lưu trữ in-memory thay cho MongoDB (dùng để benchmark / chạy không cần mongod)"""
+
+    def __init__(self) -> None:
+        self.users = InMemoryTable(unique=[("email",)])
+        self.friend_requests = InMemoryTable(
+            indexes=[("from_user", "to_user"), ("to_user", "status")],
+            sorted_indexes=["expires_at"],
+        )
+        self.messages = InMemoryTable(indexes=[("conversation_id",), ("indexed",)])
+        self.conversations = InMemoryTable(indexes=[("user_id",)], unique=[("user_id", "conversation_id")])
+        self.conversation_seqs: Dict[str, int] = {}
+        # inverted index: (term, conversation_id) -> tập seq
+        self.postings: Dict[Tuple[str, str], Set[int]] = {}
+
+    def table_names(self) -> List[str]:
+
+        return ["users", "friend_requests", "messages", "conversations", "search_index"]
+
+
+_memory_store: Optional[InMemoryStore] = None
+
+
+def get_memory_store() -> InMemoryStore:
+
+    global _memory_store
+    if _memory_store is None:
+        _memory_store = InMemoryStore()
+    return _memory_store
+
+
+def reset_memory_store() -> None:
+
+    global _memory_store
+    _memory_store = None
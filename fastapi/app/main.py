@@ -1,36 +1,91 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
 
+from app.core.deadline import deadline_middleware
+from app.core.exceptions import DeadlineExceeded
+from app.core.handlers import deadline_exceeded_handler
 from app.database.connection import close_mongo_connection, connect_to_mongo, get_database
+from app.database.deadline import with_deadline
+from app.database.memory import get_memory_store
+from app.repositories.conversation_repository import ConversationRepository
+from app.repositories.factory import make_message_repository, make_search_repository, use_memory_backend
+from app.repositories.friend_repository import FriendRepository
+from app.repositories.media_repository import MediaRepository
+from app.repositories.memory_repository import InMemoryFriendRepository
+from app.repositories.message_repository import MessageRepository
 from app.routers.admin import router as admin_router
 from app.routers.auth import router as auth_router
+from app.routers.conversations import router as conversations_router
 from app.routers.friends import router as friends_router
+from app.routers.media import router as media_router
+from app.routers.search import router as search_router
+from app.services.friend_service import run_friend_request_compaction
+from app.services.search_service import init_search_indexer
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
 
+    if use_memory_backend():
+        # Backend in-memory: không cần kết nối MongoDB (media/GridFS không được mount)
+        search_indexer = init_search_indexer(make_search_repository(), make_message_repository())
+        background_tasks = [
+            asyncio.create_task(run_friend_request_compaction(InMemoryFriendRepository(get_memory_store()))),
+            asyncio.create_task(search_indexer.run()),
+        ]
+        try:
+            yield
+        finally:
+            for task in background_tasks:
+                task.cancel()
+            await asyncio.gather(*background_tasks, return_exceptions=True)
+        return
+
     await connect_to_mongo()
+    db = get_database()
+    for repo in (MediaRepository(db), MessageRepository(db), ConversationRepository(db)):
+        try:
+            await repo.ensure_indexes()
+        except Exception as e:
+            print(f"Index creation error ({type(repo).__name__}): {e}")
+    search_indexer = init_search_indexer(make_search_repository(), make_message_repository())
+    background_tasks = [
+        asyncio.create_task(run_friend_request_compaction(FriendRepository(db))),
+        asyncio.create_task(search_indexer.run()),
+    ]
     try:
         yield
     finally:
+        for task in background_tasks:
+            task.cancel()
+        # message chưa index vẫn nằm trong MongoDB (indexed=False), lần khởi động sau sẽ xử lý tiếp
+        await asyncio.gather(*background_tasks, return_exceptions=True)
         await close_mongo_connection()
 
 
 app = FastAPI(title="FastAPI Auth with MongoDB", lifespan=lifespan)
+app.middleware("http")(deadline_middleware)
+app.add_exception_handler(DeadlineExceeded, deadline_exceeded_handler)
 
 
 app.include_router(auth_router)
 app.include_router(admin_router)
 app.include_router(friends_router)
-
+app.include_router(conversations_router)
+app.include_router(search_router)
+# Media lưu trong GridFS, không có bản in-memory: chỉ mount khi dùng MongoDB
+if not use_memory_backend():
+    app.include_router(media_router)
 
 @app.get("/")
 async def root():
 
+    if use_memory_backend():
+        return {"message": "Using in-memory storage", "collections": get_memory_store().table_names()}
     db = get_database()
-    collections = await db.list_collection_names()
+    collections = await with_deadline(db.list_collection_names)
     return {"message": "Connected to MongoDB!", "collections": collections}
 
 
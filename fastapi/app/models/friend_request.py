@@ -1,8 +1,10 @@
-from typing import Literal, Optional
+from datetime import datetime
+from typing import Literal, TypedDict
 
 class FriendRequestDocument(TypedDict, total=False):
     _id: str
     from_user: str
     to_user: str
     status: Literal["pending", "accepted", "rejected"]
-    created_at: str
+    created_at: datetime
+    expires_at: datetime
@@ -0,0 +1,27 @@
+from datetime import datetime
+from typing import Optional, TypedDict
+
+
+class MessageDocument(TypedDict, total=False):
+
+    _id: str
+    conversation_id: str
+    seq: int
+    sender_id: str
+    recipient_id: str
+    text: str
+    created_at: datetime
+    indexed: bool
+
+
+class ConversationSummaryDocument(TypedDict, total=False):
+
+    _id: str
+    user_id: str
+    conversation_id: str
+    peer_id: str
+    last_message: Optional[str]
+    last_sender_id: Optional[str]
+    last_activity: datetime
+    unread_count: int
+    last_read_at: Optional[datetime]
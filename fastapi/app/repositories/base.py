@@ -0,0 +1,84 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+
+
+class UserRepositoryProtocol(Protocol):
+    """Interface chung cho UserRepository (MongoDB) và InMemoryUserRepository"""
+
+    async def create_user(self, email: str, hashed_password: str, full_name: Optional[str], role: str = "user") -> str: ...
+
+    async def get_user_by_email(self, email: str) -> Optional[dict]: ...
+
+    async def get_user_by_id(self, user_id: str) -> Optional[dict]: ...
+
+    async def get_all_users(self) -> List[dict]: ...
+
+    async def delete_user(self, user_id: str) -> bool: ...
+
+    async def add_friend(self, user_id: str, friend_id: str) -> bool: ...
+
+
+class FriendRepositoryProtocol(Protocol):
+    """Interface chung cho FriendRepository (MongoDB) và InMemoryFriendRepository"""
+
+    async def ensure_indexes(self) -> None: ...
+
+    async def create_friend_request(self, from_user: str, to_user: str) -> str: ...
+
+    async def get_friend_request(self, from_user: str, to_user: str) -> Optional[dict]: ...
+
+    async def update_request_status(self, request_id: str, status: str) -> bool: ...
+
+    async def delete_friend_request(self, request_id: str) -> bool: ...
+
+    async def list_received_requests(self, user_id: str) -> List[dict]: ...
+
+    async def compact_requests(self) -> int: ...
+
+    async def list_friends(self, user_id: str) -> List[str]: ...
+
+    async def unfriend(self, user_id: str, friend_id: str) -> bool: ...
+
+
+class MessageRepositoryProtocol(Protocol):
+    """Interface chung cho MessageRepository (MongoDB) và InMemoryMessageRepository"""
+
+    async def ensure_indexes(self) -> None: ...
+
+    async def next_seq(self, conversation_id: str) -> int: ...
+
+    async def create_message(self, conversation_id: str, seq: int, sender_id: str, recipient_id: str, text: str, created_at: datetime) -> str: ...
+
+    async def list_messages(self, conversation_id: str, limit: int = 50, before_id: Optional[str] = None) -> List[dict]: ...
+
+    async def get_messages_by_seqs(self, seqs_by_conversation: Dict[str, List[int]], limit: int) -> List[dict]: ...
+
+    async def list_unindexed(self, limit: int) -> List[dict]: ...
+
+    async def mark_indexed(self, message_ids: List[Any]) -> None: ...
+
+
+class ConversationRepositoryProtocol(Protocol):
+    """Interface chung cho ConversationRepository (MongoDB) và InMemoryConversationRepository"""
+
+    async def ensure_indexes(self) -> None: ...
+
+    async def apply_message(self, conversation_id: str, sender_id: str, recipient_id: str, text: str, created_at: datetime) -> None: ...
+
+    async def list_for_user(self, user_id: str, limit: int = 50) -> List[dict]: ...
+
+    async def list_conversation_ids(self, user_id: str) -> List[str]: ...
+
+    async def mark_read(self, user_id: str, conversation_id: str, read_at: datetime) -> bool: ...
+
+
+class SearchRepositoryProtocol(Protocol):
+    """Interface chung cho SearchRepository (MongoDB) và InMemorySearchRepository"""
+
+    async def ensure_indexes(self) -> None: ...
+
+    async def add_postings(self, postings: Dict[Tuple[str, str], List[int]]) -> None: ...
+
+    async def compact(self, limit: int = 500) -> int: ...
+
+    async def find_postings(self, terms: List[str], conversation_ids: List[str]) -> Dict[str, List[int]]: ...
@@ -0,0 +1,77 @@
+from datetime import datetime
+from typing import List
+
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from app.database.deadline import DeadlineCollection
+
+
+class ConversationRepository:
+    """
+    Collection "conversations": mỗi user có một document tóm tắt cho mỗi cuộc hội thoại
+    (tin nhắn cuối, số tin chưa đọc), được cập nhật dần theo từng tin nhắn mới.
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self._collection = DeadlineCollection(db.get_collection("conversations"))
+
+    async def ensure_indexes(self) -> None:
+
+        await self._collection.create_index([("user_id", 1), ("conversation_id", 1)], unique=True)
+        await self._collection.create_index([("user_id", 1), ("last_activity", -1)])
+
+    @staticmethod
+    def _summary_update(peer_id: str, last: dict, unread_increment: int) -> list:
+        """
+        Pipeline update: unread luôn được cộng, nhưng tin cuối chỉ bị ghi đè khi message này
+        không cũ hơn last_activity hiện tại (hai lần gửi gần nhau có thể hoàn tất lệch thứ tự)
+        """
+        is_newer = {"$lte": [{"$ifNull": ["$last_activity", datetime.min]}, last["last_activity"]]}
+        return [{"$set": {
+            "peer_id": peer_id,
+            "unread_count": {"$add": [{"$ifNull": ["$unread_count", 0]}, unread_increment]},
+            **{field: {"$cond": [is_newer, {"$literal": value}, f"${field}"]} for field, value in last.items()},
+        }}]
+
+    async def apply_message(self, conversation_id: str, sender_id: str, recipient_id: str, text: str, created_at: datetime) -> None:
+        """Cập nhật summary của cả người gửi và người nhận trong cùng một bulk write"""
+        last = {
+            "last_message": text,
+            "last_sender_id": sender_id,
+            "last_activity": created_at,
+        }
+        await self._collection.bulk_write([
+            UpdateOne(
+                {"user_id": sender_id, "conversation_id": conversation_id},
+                self._summary_update(recipient_id, last, 0),
+                upsert=True,
+            ),
+            UpdateOne(
+                {"user_id": recipient_id, "conversation_id": conversation_id},
+                self._summary_update(sender_id, last, 1),
+                upsert=True,
+            ),
+        ], ordered=False)
+
+    async def list_for_user(self, user_id: str, limit: int = 50) -> List[dict]:
+
+        cursor = self._collection.find({"user_id": user_id}).sort("last_activity", -1).limit(limit)
+        summaries = []
+        async for doc in cursor:
+            doc["_id"] = str(doc["_id"])
+            summaries.append(doc)
+        return summaries
+
+    async def list_conversation_ids(self, user_id: str) -> List[str]:
+        """Mọi hội thoại user tham gia (covered query trên index (user_id, conversation_id))"""
+        cursor = self._collection.find({"user_id": user_id}, {"_id": 0, "conversation_id": 1})
+        return [doc["conversation_id"] async for doc in cursor]
+
+    async def mark_read(self, user_id: str, conversation_id: str, read_at: datetime) -> bool:
+
+        result = await self._collection.update_one(
+            {"user_id": user_id, "conversation_id": conversation_id},
+            {"$set": {"unread_count": 0, "last_read_at": read_at}},
+        )
+        return result.matched_count > 0
@@ -0,0 +1,71 @@
+from app.database.connection import STORAGE_BACKEND, get_database
+from app.database.memory import get_memory_store
+from app.repositories.base import (
+    ConversationRepositoryProtocol,
+    FriendRepositoryProtocol,
+    MessageRepositoryProtocol,
+    SearchRepositoryProtocol,
+    UserRepositoryProtocol,
+)
+from app.repositories.conversation_repository import ConversationRepository
+from app.repositories.friend_repository import FriendRepository
+from app.repositories.memory_repository import (
+    InMemoryConversationRepository,
+    InMemoryFriendRepository,
+    InMemoryMessageRepository,
+    InMemorySearchRepository,
+    InMemoryUserRepository,
+)
+from app.repositories.message_repository import MessageRepository
+from app.repositories.search_repository import SearchRepository
+from app.repositories.user_repository import UserRepository
+
+
+def use_memory_backend() -> bool:
+
+    return STORAGE_BACKEND == "memory"
+
+
+async def user_repository_dependency() -> UserRepositoryProtocol:
+    """Dependency: UserRepository theo STORAGE_BACKEND"""
+    if use_memory_backend():
+        return InMemoryUserRepository(get_memory_store())
+    return UserRepository(get_database())
+
+
+async def friend_repository_dependency() -> FriendRepositoryProtocol:
+    """Dependency: FriendRepository theo STORAGE_BACKEND"""
+    if use_memory_backend():
+        return InMemoryFriendRepository(get_memory_store())
+    return FriendRepository(get_database())
+
+
+def make_message_repository() -> MessageRepositoryProtocol:
+
+    if use_memory_backend():
+        return InMemoryMessageRepository(get_memory_store())
+    return MessageRepository(get_database())
+
+
+def make_search_repository() -> SearchRepositoryProtocol:
+
+    if use_memory_backend():
+        return InMemorySearchRepository(get_memory_store())
+    return SearchRepository(get_database())
+
+
+async def message_repository_dependency() -> MessageRepositoryProtocol:
+    """Dependency: MessageRepository theo STORAGE_BACKEND"""
+    return make_message_repository()
+
+
+async def conversation_repository_dependency() -> ConversationRepositoryProtocol:
+    """Dependency: ConversationRepository theo STORAGE_BACKEND"""
+    if use_memory_backend():
+        return InMemoryConversationRepository(get_memory_store())
+    return ConversationRepository(get_database())
+
+
+async def search_repository_dependency() -> SearchRepositoryProtocol:
+    """Dependency: SearchRepository theo STORAGE_BACKEND"""
+    return make_search_repository()
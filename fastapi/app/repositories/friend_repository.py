@@ -1,32 +1,63 @@
+import os
 from typing import Optional
-from datetime import datetime
+from datetime import datetime, timedelta
 from motor.motor_asyncio import AsyncIOMotorDatabase
 from bson import ObjectId
+from pymongo import UpdateOne
+from app.database.deadline import DeadlineCollection
+
+# Vòng đời của lời mời kết bạn (đơn vị: ngày)
+FRIEND_REQUEST_PENDING_DAYS = int(os.getenv("FRIEND_REQUEST_PENDING_DAYS", "30"))
+FRIEND_REQUEST_RETENTION_DAYS = int(os.getenv("FRIEND_REQUEST_RETENTION_DAYS", "7"))
+FRIEND_REQUEST_MIGRATION_BATCH_SIZE = 1000
+
+
+def serialize_created_at(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
 
 class FriendRepository:
     def __init__(self, db: AsyncIOMotorDatabase) -> None:
-        self._collection = db.get_collection("friend_requests")
-        self._user_collection = db.get_collection("users")
+        self._collection = DeadlineCollection(db.get_collection("friend_requests"))
+        self._user_collection = DeadlineCollection(db.get_collection("users"))
+
+    async def ensure_indexes(self) -> None:
+        # TTL index: Mongo tự xoá document khi expires_at (BSON date) đã qua
+        await self._collection.create_index("expires_at", expireAfterSeconds=0)
+        await self._collection.create_index([("from_user", 1), ("to_user", 1)])
+        await self._collection.create_index([("to_user", 1), ("status", 1)])
 
     async def create_friend_request(self, from_user: str, to_user: str) -> str:
+        now = datetime.utcnow()
         doc = {
             "from_user": from_user,
             "to_user": to_user,
             "status": "pending",
-            "created_at": datetime.utcnow().isoformat()
+            "created_at": now,
+            "expires_at": now + timedelta(days=FRIEND_REQUEST_PENDING_DAYS),
         }
         result = await self._collection.insert_one(doc)
         return str(result.inserted_id)
 
     async def get_friend_request(self, from_user: str, to_user: str) -> Optional[dict]:
-        doc = await self._collection.find_one({"from_user": from_user, "to_user": to_user})
+        # TTL monitor chỉ chạy định kỳ, nên bỏ qua các row đã hết hạn nhưng chưa bị xoá
+        doc = await self._collection.find_one({
+            "from_user": from_user,
+            "to_user": to_user,
+            "expires_at": {"$not": {"$lte": datetime.utcnow()}},
+        })
         if not doc:
             return None
         doc["_id"] = str(doc["_id"])  # normalize for API layer
         return doc
 
     async def update_request_status(self, request_id: str, status: str) -> bool:
-        result = await self._collection.update_one({"_id": ObjectId(request_id)}, {"$set": {"status": status}})
+        update = {"status": status}
+        if status != "pending":
+            if FRIEND_REQUEST_RETENTION_DAYS <= 0:
+                return await self.delete_friend_request(request_id)
+            update["expires_at"] = datetime.utcnow() + timedelta(days=FRIEND_REQUEST_RETENTION_DAYS)
+        result = await self._collection.update_one({"_id": ObjectId(request_id)}, {"$set": update})
         return result.modified_count > 0
 
     async def delete_friend_request(self, request_id: str) -> bool:
@@ -34,7 +65,11 @@ class FriendRepository:
         return result.deleted_count > 0
 
     async def list_received_requests(self, user_id: str):
-        cursor = self._collection.find({"to_user": user_id, "status": "pending"})
+        cursor = self._collection.find({
+            "to_user": user_id,
+            "status": "pending",
+            "expires_at": {"$not": {"$lte": datetime.utcnow()}},
+        })
         results = []
         async for doc in cursor:
             results.append({
@@ -42,10 +77,47 @@ class FriendRepository:
                 "from_user": doc.get("from_user"),
                 "to_user": doc.get("to_user"),
                 "status": doc.get("status"),
-                "created_at": doc.get("created_at"),
+                "created_at": serialize_created_at(doc.get("created_at")),
             })
         return results
 
+    async def compact_requests(self) -> int:
+        """
+        Dọn dẹp friend_requests:
+        - Chuyển created_at dạng chuỗi (dữ liệu cũ) sang BSON date và gán expires_at
+        - Xoá các row đã hết hạn mà TTL monitor chưa kịp xoá
+        Trả về số row đã xoá.
+        """
+        now = datetime.utcnow()
+        while True:
+            # xử lý theo trang, mỗi trang một bulk_write; row đã migrate không còn khớp query
+            cursor = self._collection.find(
+                {"expires_at": {"$exists": False}}, {"created_at": 1, "status": 1}
+            ).limit(FRIEND_REQUEST_MIGRATION_BATCH_SIZE)
+            operations = []
+            async for doc in cursor:
+                created_at = doc.get("created_at")
+                if isinstance(created_at, str):
+                    try:
+                        created_at = datetime.fromisoformat(created_at)
+                    except ValueError:
+                        created_at = now
+                elif not isinstance(created_at, datetime):
+                    created_at = now
+                if doc.get("status") == "pending":
+                    expires_at = created_at + timedelta(days=FRIEND_REQUEST_PENDING_DAYS)
+                else:
+                    expires_at = now + timedelta(days=FRIEND_REQUEST_RETENTION_DAYS)
+                operations.append(UpdateOne(
+                    {"_id": doc["_id"]},
+                    {"$set": {"created_at": created_at, "expires_at": expires_at}},
+                ))
+            if not operations:
+                break
+            await self._collection.bulk_write(operations, ordered=False)
+        result = await self._collection.delete_many({"expires_at": {"$lte": now}})
+        return result.deleted_count
+
     async def list_friends(self, user_id: str):
         user = await self._user_collection.find_one({"_id": ObjectId(user_id)})
         return user.get("friends", []) if user else []
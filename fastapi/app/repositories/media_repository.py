@@ -0,0 +1,122 @@
+import hashlib
+from typing import AsyncIterator, Optional
+
+from bson import ObjectId
+from gridfs.errors import NoFile
+from motor.motor_asyncio import AsyncIOMotorDatabase, AsyncIOMotorGridFSBucket
+from pymongo.errors import DuplicateKeyError
+
+from app.core.deadline import MEDIA_WRITE_DEADLINE_MS, REQUEST_DEADLINE_DEFAULT_MS, deadline_scope
+from app.database.deadline import DeadlineCollection, with_deadline
+
+
+MEDIA_BUCKET_NAME = "media"
+
+
+class MediaRepository:
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self._bucket = AsyncIOMotorGridFSBucket(db, bucket_name=MEDIA_BUCKET_NAME)
+        self._files = DeadlineCollection(db.get_collection(f"{MEDIA_BUCKET_NAME}.files"))
+
+    async def ensure_indexes(self) -> None:
+
+        # unique: hai upload giống nhau chạy song song không thể cùng giữ sha256 (xem upload_stream)
+        await self._files.create_index(
+            "metadata.sha256",
+            unique=True,
+            partialFilterExpression={"metadata.sha256": {"$exists": True}},
+        )
+
+    async def upload_stream(self, filename: str, content_type: Optional[str], owner_id: str, chunks: AsyncIterator[bytes]) -> str:
+        """
+        Ghi từng chunk thẳng vào GridFS (không buffer cả file), tính sha256 trong lúc ghi.
+        Nếu nội dung đã tồn tại thì xoá bản vừa ghi và trả về id của bản cũ.
+        """
+        digest = hashlib.sha256()
+        grid_in = self._bucket.open_upload_stream(
+            filename,
+            metadata={"content_type": content_type, "owners": [owner_id]},
+        )
+        try:
+            async for chunk in chunks:
+                digest.update(chunk)
+                # mỗi chunk có budget riêng: upload lớn/chậm không bị cắt bởi một deadline tổng,
+                # nhưng một lần ghi bị treo (DB brownout) vẫn dừng nhanh
+                with deadline_scope(MEDIA_WRITE_DEADLINE_MS):
+                    await with_deadline(lambda: grid_in.write(chunk))
+            with deadline_scope(MEDIA_WRITE_DEADLINE_MS):
+                await with_deadline(grid_in.close)
+        except BaseException:
+            await self._abort_upload(grid_in)
+            raise
+        new_id = grid_in._id
+        sha256 = digest.hexdigest()
+
+        try:
+            with deadline_scope(REQUEST_DEADLINE_DEFAULT_MS):
+                try:
+                    # gán sha256 trước; unique index quyết định bản nào được giữ nên không bị race
+                    await self._files.update_one({"_id": new_id}, {"$set": {"metadata.sha256": sha256}})
+                    return str(new_id)
+                except DuplicateKeyError:
+                    pass
+                existing = await self._files.find_one_and_update(
+                    {"metadata.sha256": sha256},
+                    {"$addToSet": {"metadata.owners": owner_id}},
+                    projection={"_id": 1},
+                )
+                if existing is None:
+                    raise RuntimeError("Duplicate media disappeared during upload")
+                await with_deadline(lambda: self._bucket.delete(new_id))
+                return str(existing["_id"])
+        except BaseException:
+            # không để lại file thiếu sha256 (không bao giờ dedupe được)
+            await self._discard_file(new_id)
+            raise
+
+    async def _abort_upload(self, grid_in) -> None:
+
+        try:
+            with deadline_scope(REQUEST_DEADLINE_DEFAULT_MS):
+                await with_deadline(grid_in.abort)
+        except Exception as e:
+            print(f"Media upload abort error: {e}")
+
+    async def _discard_file(self, file_id: ObjectId) -> None:
+
+        try:
+            with deadline_scope(REQUEST_DEADLINE_DEFAULT_MS):
+                await with_deadline(lambda: self._bucket.delete(file_id))
+        except Exception as e:
+            # NoFile nếu file đã bị xoá trong nhánh dedupe
+            print(f"Media cleanup error: {e}")
+
+    async def get_file(self, media_id: str) -> Optional[dict]:
+
+        if not ObjectId.is_valid(media_id):
+            return None
+        doc = await self._files.find_one({"_id": ObjectId(media_id)})
+        if doc:
+            doc["_id"] = str(doc["_id"])
+        return doc
+
+    async def open_download(self, media_id: str, start: int):
+        """Mở GridOut và seek tới start; trả về None nếu file không còn tồn tại"""
+        try:
+            grid_out = await with_deadline(lambda: self._bucket.open_download_stream(ObjectId(media_id)))
+        except NoFile:
+            return None
+        grid_out.seek(start)
+        return grid_out
+
+    @staticmethod
+    async def iter_range(grid_out, length: int, chunk_size: int) -> AsyncIterator[bytes]:
+        """Đọc tuần tự length byte từ GridOut đã mở theo từng chunk"""
+        remaining = length
+        while remaining > 0:
+            data = await grid_out.read(min(chunk_size, remaining))
+            if not data:
+                break
+            remaining -= len(data)
+            yield data
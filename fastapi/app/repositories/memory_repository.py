@@ -0,0 +1,267 @@
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.database.memory import InMemoryStore
+from app.repositories.friend_repository import (
+    FRIEND_REQUEST_PENDING_DAYS,
+    FRIEND_REQUEST_RETENTION_DAYS,
+    serialize_created_at,
+)
+
+
+class InMemoryUserRepository:
+
+    def __init__(self, store: InMemoryStore) -> None:
+        self._users = store.users
+
+    async def create_user(self, email: str, hashed_password: str, full_name: Optional[str], role: str = "user") -> str:
+
+        return self._users.insert({
+            "email": email,
+            "hashed_password": hashed_password,
+            "full_name": full_name,
+            "role": role
+        })
+
+    async def get_user_by_email(self, email: str) -> Optional[dict]:
+
+        return self._users.find_one(email=email)
+
+    async def get_user_by_id(self, user_id: str) -> Optional[dict]:
+
+        return self._users.get(user_id)
+
+    async def get_all_users(self) -> List[dict]:
+
+        return self._users.all()
+
+    async def delete_user(self, user_id: str) -> bool:
+
+        return self._users.delete(user_id)
+
+    async def add_friend(self, user_id: str, friend_id: str) -> bool:
+
+        user = self._users.get(user_id)
+        if not user or friend_id in user.get("friends", []):
+            return False
+        return self._users.update(user_id, {"friends": [*user.get("friends", []), friend_id]})
+
+
+class InMemoryFriendRepository:
+
+    def __init__(self, store: InMemoryStore) -> None:
+        self._requests = store.friend_requests
+        self._users = store.users
+
+    async def ensure_indexes(self) -> None:
+
+        return None
+
+    async def create_friend_request(self, from_user: str, to_user: str) -> str:
+
+        now = datetime.utcnow()
+        return self._requests.insert({
+            "from_user": from_user,
+            "to_user": to_user,
+            "status": "pending",
+            "created_at": now,
+            "expires_at": now + timedelta(days=FRIEND_REQUEST_PENDING_DAYS),
+        })
+
+    async def get_friend_request(self, from_user: str, to_user: str) -> Optional[dict]:
+
+        now = datetime.utcnow()
+        for doc in self._requests.find(from_user=from_user, to_user=to_user):
+            if doc.get("expires_at") is None or doc["expires_at"] > now:
+                return doc
+        return None
+
+    async def update_request_status(self, request_id: str, status: str) -> bool:
+
+        update = {"status": status}
+        if status != "pending":
+            if FRIEND_REQUEST_RETENTION_DAYS <= 0:
+                return await self.delete_friend_request(request_id)
+            update["expires_at"] = datetime.utcnow() + timedelta(days=FRIEND_REQUEST_RETENTION_DAYS)
+        return self._requests.update(request_id, update)
+
+    async def delete_friend_request(self, request_id: str) -> bool:
+
+        return self._requests.delete(request_id)
+
+    async def list_received_requests(self, user_id: str) -> List[dict]:
+
+        now = datetime.utcnow()
+        return [
+            {
+                "id": doc["_id"],
+                "from_user": doc.get("from_user"),
+                "to_user": doc.get("to_user"),
+                "status": doc.get("status"),
+                "created_at": serialize_created_at(doc.get("created_at")),
+            }
+            for doc in self._requests.find(to_user=user_id, status="pending")
+            if doc.get("expires_at") is None or doc["expires_at"] > now
+        ]
+
+    async def compact_requests(self) -> int:
+        """Xoá các lời mời đã hết hạn (tương đương TTL index, dùng index sắp xếp theo expires_at)"""
+        expired = self._requests.range("expires_at", datetime.utcnow())
+        return sum(1 for request_id in expired if self._requests.delete(request_id))
+
+    async def list_friends(self, user_id: str) -> List[str]:
+
+        user = self._users.get(user_id)
+        return user.get("friends", []) if user else []
+
+    async def unfriend(self, user_id: str, friend_id: str) -> bool:
+
+        changed = False
+        for owner, other in ((user_id, friend_id), (friend_id, user_id)):
+            user = self._users.get(owner)
+            if user and other in user.get("friends", []):
+                changed = self._users.update(owner, {"friends": [f for f in user["friends"] if f != other]}) or changed
+        return changed
+
+
+class InMemoryMessageRepository:
+
+    def __init__(self, store: InMemoryStore) -> None:
+        self._messages = store.messages
+        self._seqs = store.conversation_seqs
+
+    async def ensure_indexes(self) -> None:
+
+        return None
+
+    async def next_seq(self, conversation_id: str) -> int:
+
+        self._seqs[conversation_id] = self._seqs.get(conversation_id, 0) + 1
+        return self._seqs[conversation_id]
+
+    async def create_message(self, conversation_id: str, seq: int, sender_id: str, recipient_id: str, text: str, created_at: datetime) -> str:
+
+        return self._messages.insert({
+            "conversation_id": conversation_id,
+            "seq": seq,
+            "sender_id": sender_id,
+            "recipient_id": recipient_id,
+            "text": text,
+            "created_at": created_at,
+            "indexed": False,
+        })
+
+    async def list_messages(self, conversation_id: str, limit: int = 50, before_id: Optional[str] = None) -> List[dict]:
+
+        # _id là hex của ObjectId (độ dài cố định) nên so sánh chuỗi giữ đúng thứ tự
+        messages = [
+            msg for msg in self._messages.find(conversation_id=conversation_id)
+            if before_id is None or msg["_id"] < before_id
+        ]
+        messages.sort(key=lambda msg: msg["_id"], reverse=True)
+        return messages[:limit]
+
+    async def get_messages_by_seqs(self, seqs_by_conversation: Dict[str, List[int]], limit: int) -> List[dict]:
+
+        messages = []
+        for conversation_id, seqs in seqs_by_conversation.items():
+            wanted = set(seqs)
+            messages.extend(msg for msg in self._messages.find(conversation_id=conversation_id) if msg["seq"] in wanted)
+        messages.sort(key=lambda msg: msg["created_at"], reverse=True)
+        return messages[:limit]
+
+    async def list_unindexed(self, limit: int) -> List[dict]:
+
+        messages = sorted(self._messages.find(indexed=False), key=lambda msg: msg["_id"])
+        return messages[:limit]
+
+    async def mark_indexed(self, message_ids: List[Any]) -> None:
+
+        for message_id in message_ids:
+            self._messages.update(message_id, {"indexed": True})
+
+class InMemoryConversationRepository:
+
+    def __init__(self, store: InMemoryStore) -> None:
+        self._conversations = store.conversations
+
+    async def ensure_indexes(self) -> None:
+
+        return None
+
+    def _upsert(self, user_id: str, conversation_id: str, changes: dict, unread_increment: int) -> None:
+
+        doc = self._conversations.find_one(user_id=user_id, conversation_id=conversation_id)
+        if doc is None:
+            self._conversations.insert({
+                "user_id": user_id,
+                "conversation_id": conversation_id,
+                "unread_count": unread_increment,
+                **changes,
+            })
+        else:
+            update = {"peer_id": changes["peer_id"], "unread_count": doc.get("unread_count", 0) + unread_increment}
+            # tin cuối chỉ bị ghi đè bởi message không cũ hơn (giống ConversationRepository)
+            if doc.get("last_activity") is None or doc["last_activity"] <= changes["last_activity"]:
+                update.update(changes)
+            self._conversations.update(doc["_id"], update)
+
+    async def apply_message(self, conversation_id: str, sender_id: str, recipient_id: str, text: str, created_at: datetime) -> None:
+
+        last = {
+            "last_message": text,
+            "last_sender_id": sender_id,
+            "last_activity": created_at,
+        }
+        self._upsert(sender_id, conversation_id, {**last, "peer_id": recipient_id}, 0)
+        self._upsert(recipient_id, conversation_id, {**last, "peer_id": sender_id}, 1)
+
+    async def list_for_user(self, user_id: str, limit: int = 50) -> List[dict]:
+
+        summaries = self._conversations.find(user_id=user_id)
+        summaries.sort(key=lambda doc: doc["last_activity"], reverse=True)
+        return summaries[:limit]
+
+    async def list_conversation_ids(self, user_id: str) -> List[str]:
+
+        return [doc["conversation_id"] for doc in self._conversations.find(user_id=user_id)]
+
+    async def mark_read(self, user_id: str, conversation_id: str, read_at: datetime) -> bool:
+
+        doc = self._conversations.find_one(user_id=user_id, conversation_id=conversation_id)
+        if doc is None:
+            return False
+        self._conversations.update(doc["_id"], {"unread_count": 0, "last_read_at": read_at})
+        return True
+
+
+class InMemorySearchRepository:
+    """Inverted index in-memory: (term, conversation_id) -> tập seq (không nén)"""
+
+    def __init__(self, store: InMemoryStore) -> None:
+        self._postings = store.postings
+
+    async def ensure_indexes(self) -> None:
+
+        return None
+
+    async def add_postings(self, postings: Dict[Tuple[str, str], List[int]]) -> None:
+
+        for key, seqs in postings.items():
+            self._postings.setdefault(key, set()).update(seqs)
+
+    async def compact(self, limit: int = 500) -> int:
+
+        return 0
+
+    async def find_postings(self, terms: List[str], conversation_ids: List[str]) -> Dict[str, List[int]]:
+
+        results: Dict[str, List[int]] = {}
+        for conversation_id in conversation_ids:
+            term_seqs = [self._postings.get((term, conversation_id)) for term in terms]
+            if not all(term_seqs):
+                continue
+            common = set.intersection(*term_seqs)
+            if common:
+                results[conversation_id] = sorted(common, reverse=True)
+        return results
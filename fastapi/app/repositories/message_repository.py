@@ -0,0 +1,94 @@
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import ReturnDocument
+
+from app.database.deadline import DeadlineCollection
+
+
+def make_conversation_id(user_a: str, user_b: str) -> str:
+    """Conversation 1-1 được định danh bởi cặp user id đã sắp xếp"""
+    return ":".join(sorted([user_a, user_b]))
+
+
+class MessageRepository:
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self._collection = DeadlineCollection(db.get_collection("messages"))
+        self._counter_collection = DeadlineCollection(db.get_collection("conversation_counters"))
+
+    async def ensure_indexes(self) -> None:
+
+        await self._collection.create_index([("conversation_id", 1), ("created_at", -1)])
+        # lịch sử tin nhắn sort/phân trang theo _id
+        await self._collection.create_index([("conversation_id", 1), ("_id", -1)])
+        await self._collection.create_index([("conversation_id", 1), ("seq", 1)])
+        # hàng đợi bền của search index: chỉ chứa các message chưa được index
+        await self._collection.create_index(
+            [("indexed", 1), ("_id", 1)], name="unindexed_messages", partialFilterExpression={"indexed": False}
+        )
+
+    async def next_seq(self, conversation_id: str) -> int:
+        """Số thứ tự tăng dần của message trong một conversation (dùng cho search index)"""
+        counter = await self._counter_collection.find_one_and_update(
+            {"_id": conversation_id},
+            {"$inc": {"seq": 1}},
+            upsert=True,
+            return_document=ReturnDocument.AFTER,
+        )
+        return counter["seq"]
+
+    async def create_message(self, conversation_id: str, seq: int, sender_id: str, recipient_id: str, text: str, created_at: datetime) -> str:
+
+        doc = {
+            "conversation_id": conversation_id,
+            "seq": seq,
+            "sender_id": sender_id,
+            "recipient_id": recipient_id,
+            "text": text,
+            "created_at": created_at,
+            "indexed": False,
+        }
+        result = await self._collection.insert_one(doc)
+        return str(result.inserted_id)
+
+    async def list_messages(self, conversation_id: str, limit: int = 50, before_id: Optional[str] = None) -> List[dict]:
+
+        query: dict = {"conversation_id": conversation_id}
+        if before_id:
+            query["_id"] = {"$lt": ObjectId(before_id)}
+        cursor = self._collection.find(query).sort("_id", -1).limit(limit)
+        messages = []
+        async for doc in cursor:
+            doc["_id"] = str(doc["_id"])
+            messages.append(doc)
+        return messages
+
+    async def get_messages_by_seqs(self, seqs_by_conversation: Dict[str, List[int]], limit: int) -> List[dict]:
+        """Lấy các message theo (conversation_id, seq) của nhiều conversation trong một query, mới nhất trước"""
+        if not seqs_by_conversation:
+            return []
+        query = {"$or": [
+            {"conversation_id": conversation_id, "seq": {"$in": seqs}}
+            for conversation_id, seqs in seqs_by_conversation.items()
+        ]}
+        cursor = self._collection.find(query).sort("created_at", -1).limit(limit)
+        messages = []
+        async for doc in cursor:
+            doc["_id"] = str(doc["_id"])
+            messages.append(doc)
+        return messages
+
+    async def list_unindexed(self, limit: int) -> List[dict]:
+        """Các message chưa vào search index (cũ nhất trước)"""
+        cursor = self._collection.find(
+            {"indexed": False},
+            {"conversation_id": 1, "seq": 1, "text": 1},
+        ).sort("_id", 1).limit(limit)
+        return [doc async for doc in cursor]
+
+    async def mark_indexed(self, message_ids: List[ObjectId]) -> None:
+
+        await self._collection.update_many({"_id": {"$in": message_ids}}, {"$set": {"indexed": True}})
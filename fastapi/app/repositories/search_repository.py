@@ -0,0 +1,86 @@
+from typing import Dict, List, Tuple
+
+from bson import Binary
+from motor.motor_asyncio import AsyncIOMotorDatabase
+from pymongo import UpdateOne
+
+from app.database.deadline import DeadlineCollection
+from app.utils.search import decode_postings, encode_postings
+
+
+# Số chunk tối đa trong một posting list trước khi được gộp lại thành một chunk
+MAX_POSTING_CHUNKS = 16
+
+
+class SearchRepository:
+    """
+    Inverted index cho tin nhắn: mỗi document ứng với một cặp (term, conversation_id),
+    posting list là danh sách các chunk (seq của message, mã hoá delta + varint).
+    """
+
+    def __init__(self, db: AsyncIOMotorDatabase) -> None:
+        self._collection = DeadlineCollection(db.get_collection("search_index"))
+
+    async def ensure_indexes(self) -> None:
+
+        await self._collection.create_index([("term", 1), ("conversation_id", 1)], unique=True)
+        await self._collection.create_index("chunk_count")
+
+    async def add_postings(self, postings: Dict[Tuple[str, str], List[int]]) -> None:
+        """Ghi một batch posting: mỗi (term, conversation_id) được append thêm một chunk"""
+        if not postings:
+            return
+        operations = [
+            UpdateOne(
+                {"term": term, "conversation_id": conversation_id},
+                {
+                    "$push": {"chunks": Binary(encode_postings(seqs))},
+                    "$inc": {"chunk_count": 1},
+                },
+                upsert=True,
+            )
+            for (term, conversation_id), seqs in postings.items()
+        ]
+        await self._collection.bulk_write(operations, ordered=False)
+
+    async def compact(self, limit: int = 500) -> int:
+        """Gộp các posting list có quá nhiều chunk thành một chunk duy nhất"""
+        operations = []
+        cursor = self._collection.find({"chunk_count": {"$gte": MAX_POSTING_CHUNKS}}).limit(limit)
+        async for doc in cursor:
+            seqs = set()
+            for chunk in doc.get("chunks", []):
+                seqs.update(decode_postings(chunk))
+            # optimistic concurrency: nếu chunk_count đã đổi (có chunk mới hoặc compactor khác chạy trước)
+            # thì update không khớp và posting list được gộp ở lần compact sau
+            operations.append(UpdateOne(
+                {"_id": doc["_id"], "chunk_count": doc["chunk_count"]},
+                {"$set": {"chunks": [Binary(encode_postings(seqs))], "chunk_count": 1}},
+            ))
+        if operations:
+            await self._collection.bulk_write(operations, ordered=False)
+        return len(operations)
+
+    async def find_postings(self, terms: List[str], conversation_ids: List[str]) -> Dict[str, List[int]]:
+        """
+        Trả về seq của các message chứa tất cả các term, theo từng conversation
+        """
+        matches: Dict[str, Dict[str, set]] = {}
+        cursor = self._collection.find(
+            {"term": {"$in": terms}, "conversation_id": {"$in": conversation_ids}},
+            {"term": 1, "conversation_id": 1, "chunks": 1},
+        )
+        async for doc in cursor:
+            seqs = set()
+            for chunk in doc.get("chunks", []):
+                seqs.update(decode_postings(chunk))
+            matches.setdefault(doc["conversation_id"], {})[doc["term"]] = seqs
+
+        results: Dict[str, List[int]] = {}
+        for conversation_id, by_term in matches.items():
+            if len(by_term) < len(terms):
+                continue
+            common = set.intersection(*by_term.values())
+            if common:
+                results[conversation_id] = sorted(common, reverse=True)
+        return results
@@ -3,11 +3,13 @@ from typing import List, Optional
 from bson import ObjectId
 from motor.motor_asyncio import AsyncIOMotorDatabase
 
+from app.database.deadline import DeadlineCollection
+
 
 class UserRepository:
 
     def __init__(self, db: AsyncIOMotorDatabase) -> None:
-        self._collection = db.get_collection("users")
+        self._collection = DeadlineCollection(db.get_collection("users"))
 
     async def create_user(self, email: str, hashed_password: str, full_name: Optional[str], role: str = "user") -> str:
 
@@ -47,4 +49,9 @@ class UserRepository:
         result = await self._collection.delete_one({"_id": ObjectId(user_id)})
         return result.deleted_count > 0
 
+    async def add_friend(self, user_id: str, friend_id: str) -> bool:
+
+        # $addToSet để tránh trùng
+        result = await self._collection.update_one({"_id": ObjectId(user_id)}, {"$addToSet": {"friends": friend_id}})
+        return result.modified_count > 0
 
@@ -1,7 +1,9 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 
-from app.database.connection import mongo_db_dependency
-from app.repositories.user_repository import UserRepository
+from app.core.deadline import timeout_counter
+from app.core.exceptions import DeadlineExceeded
+from app.repositories.base import UserRepositoryProtocol
+from app.repositories.factory import user_repository_dependency
 from app.schemas.user import UserPublic
 from app.services.user_service import UserService
 from app.utils.dependencies import get_current_admin_user
@@ -10,9 +12,8 @@ from app.utils.dependencies import get_current_admin_user
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 
-async def get_user_service(db = Depends(mongo_db_dependency)) -> UserService:
+async def get_user_service(user_repo: UserRepositoryProtocol = Depends(user_repository_dependency)) -> UserService:
     """Dependency inject UserService với UserRepository"""
-    user_repo = UserRepository(db)
     return UserService(user_repo)
 
 
@@ -28,6 +29,8 @@ async def get_all_users(
     try:
         users = await user_service.get_all_users()
         return users
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -53,9 +56,19 @@ async def delete_user(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=str(e)
         )
+    except DeadlineExceeded:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Error deleting user: {str(e)}"
         )
 
+
+@router.get("/metrics/timeouts")
+async def get_timeout_metrics(current_admin: dict = Depends(get_current_admin_user)):
+    """
+    API Admin: Số request bị hết deadline (503) theo từng route
+    - Yêu cầu: Đăng nhập với role admin
+    """
+    return {"timeouts": dict(timeout_counter)}
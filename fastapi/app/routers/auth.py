@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 
-from app.database.connection import mongo_db_dependency
-from app.repositories.user_repository import UserRepository
+from app.repositories.base import UserRepositoryProtocol
+from app.repositories.factory import user_repository_dependency
 from app.schemas.user import Token, UserCreate, UserPublic
 from app.services.user_service import UserService
 from app.utils.security import create_access_token
@@ -12,9 +12,8 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 # Khởi tạo UserService ở đây để tái sử dụng
-async def get_user_service(db = Depends(mongo_db_dependency)) -> UserService:
+async def get_user_service(user_repo: UserRepositoryProtocol = Depends(user_repository_dependency)) -> UserService:
     """Dependency inject UserService với UserRepository"""
-    user_repo = UserRepository(db)
     return UserService(user_repo)
 
 
@@ -0,0 +1,91 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.repositories.base import ConversationRepositoryProtocol, FriendRepositoryProtocol, MessageRepositoryProtocol
+from app.repositories.factory import (
+    conversation_repository_dependency,
+    friend_repository_dependency,
+    message_repository_dependency,
+)
+from app.schemas.message import ConversationSummary, MessageCreate, MessagePublic
+from app.services.message_service import MessageService
+from app.services.search_service import get_search_indexer
+from app.utils.dependencies import get_current_user
+
+
+router = APIRouter(prefix="/conversations", tags=["conversations"])
+
+
+def get_message_service(
+    message_repo: MessageRepositoryProtocol = Depends(message_repository_dependency),
+    conversation_repo: ConversationRepositoryProtocol = Depends(conversation_repository_dependency),
+    friend_repo: FriendRepositoryProtocol = Depends(friend_repository_dependency)
+) -> MessageService:
+    """Dependency inject MessageService"""
+    return MessageService(message_repo, conversation_repo, friend_repo, get_search_indexer())
+
+
+@router.get("", response_model=list[ConversationSummary])
+async def list_conversations(
+    limit: int = Query(default=50, ge=1, le=200),
+    current_user: dict = Depends(get_current_user),
+    service: MessageService = Depends(get_message_service)
+):
+    """
+    API: Danh sách hội thoại (tin nhắn cuối + số tin chưa đọc)
+    """
+    return await service.get_conversations(current_user["_id"], limit)
+
+
+@router.post("/{peer_id}/messages", response_model=MessagePublic, status_code=status.HTTP_201_CREATED)
+async def send_message(
+    peer_id: str,
+    payload: MessageCreate,
+    current_user: dict = Depends(get_current_user),
+    service: MessageService = Depends(get_message_service)
+):
+    """
+    API: Gửi tin nhắn cho bạn bè
+    """
+    try:
+        return await service.send_message(current_user["_id"], peer_id, payload.text)
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+
+@router.get("/{peer_id}/messages", response_model=list[MessagePublic])
+async def list_messages(
+    peer_id: str,
+    limit: int = Query(default=50, ge=1, le=200),
+    before: Optional[str] = None,
+    current_user: dict = Depends(get_current_user),
+    service: MessageService = Depends(get_message_service)
+):
+    """
+    API: Lịch sử tin nhắn với một người bạn (mới nhất trước, phân trang bằng ?before=<message_id>)
+    """
+    try:
+        return await service.get_messages(current_user["_id"], peer_id, limit, before)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+
+@router.post("/{peer_id}/read")
+async def mark_conversation_read(
+    peer_id: str,
+    current_user: dict = Depends(get_current_user),
+    service: MessageService = Depends(get_message_service)
+):
+    """
+    API: Đánh dấu đã đọc hội thoại (reset unread_count)
+    """
+    try:
+        ok = await service.mark_read(current_user["_id"], peer_id)
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+    if not ok:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Conversation not found.")
+    return {"msg": "Marked as read"}
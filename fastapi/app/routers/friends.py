@@ -1,15 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from app.database.connection import mongo_db_dependency
-from app.repositories.friend_repository import FriendRepository
-from app.repositories.user_repository import UserRepository
+from app.repositories.base import FriendRepositoryProtocol, UserRepositoryProtocol
+from app.repositories.factory import friend_repository_dependency, user_repository_dependency
 from app.services.friend_service import FriendService
 from app.utils.dependencies import get_current_user
 
 router = APIRouter(prefix="/friends", tags=["friend"])
 
-def get_friend_service(db = Depends(mongo_db_dependency)):
-    friend_repo = FriendRepository(db)
-    user_repo = UserRepository(db)
+def get_friend_service(
+    friend_repo: FriendRepositoryProtocol = Depends(friend_repository_dependency),
+    user_repo: UserRepositoryProtocol = Depends(user_repository_dependency)
+):
     return FriendService(friend_repo, user_repo)
 
 @router.post("/request/{target_user_id}")
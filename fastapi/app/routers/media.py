@@ -0,0 +1,81 @@
+from typing import Optional
+
+from fastapi import APIRouter, Depends, File, Header, HTTPException, UploadFile, status
+from fastapi.responses import StreamingResponse
+
+from app.database.connection import mongo_db_dependency
+from app.repositories.friend_repository import FriendRepository
+from app.repositories.media_repository import MediaRepository
+from app.services.media_service import MediaService, parse_range_header
+from app.utils.dependencies import get_current_user
+
+
+router = APIRouter(prefix="/media", tags=["media"])
+
+
+def get_media_service(db = Depends(mongo_db_dependency)) -> MediaService:
+    """Dependency inject MediaService với MediaRepository + FriendRepository"""
+    return MediaService(MediaRepository(db), FriendRepository(db))
+
+
+@router.post("", status_code=status.HTTP_201_CREATED)
+async def upload_media(
+    file: UploadFile = File(...),
+    current_user: dict = Depends(get_current_user),
+    service: MediaService = Depends(get_media_service)
+):
+    """
+    API: Upload ảnh/file (stream từng chunk vào GridFS)
+    """
+    return await service.upload_media(current_user["_id"], file)
+
+
+@router.get("/{media_id}")
+async def download_media(
+    media_id: str,
+    range_header: Optional[str] = Header(default=None, alias="Range"),
+    current_user: dict = Depends(get_current_user),
+    service: MediaService = Depends(get_media_service)
+):
+    """
+    API: Tải media, hỗ trợ header Range (HTTP 206)
+    - Chỉ chủ sở hữu hoặc bạn bè của chủ sở hữu được xem
+    """
+    try:
+        media = await service.get_media_for_user(media_id, current_user["_id"])
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except PermissionError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail=str(e))
+
+    length = media.get("length", 0)
+    try:
+        byte_range = parse_range_header(range_header, length)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE,
+            detail=str(e),
+            headers={"Content-Range": f"bytes */{length}"}
+        )
+
+    headers = {"Accept-Ranges": "bytes"}
+    media_type = media.get("metadata", {}).get("content_type") or "application/octet-stream"
+    if byte_range is None:
+        start, end, status_code = 0, length - 1, status.HTTP_200_OK
+    else:
+        start, end = byte_range
+        status_code = status.HTTP_206_PARTIAL_CONTENT
+        headers["Content-Range"] = f"bytes {start}-{end}/{length}"
+    headers["Content-Length"] = str(max(end - start + 1, 0))
+
+    try:
+        body = await service.open_media_stream(media["_id"], start, end)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+
+    return StreamingResponse(
+        body,
+        status_code=status_code,
+        media_type=media_type,
+        headers=headers
+    )
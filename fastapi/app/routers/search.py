@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.repositories.base import ConversationRepositoryProtocol, MessageRepositoryProtocol, SearchRepositoryProtocol
+from app.repositories.factory import (
+    conversation_repository_dependency,
+    message_repository_dependency,
+    search_repository_dependency,
+)
+from app.schemas.message import MessagePublic
+from app.services.search_service import SearchService
+from app.utils.dependencies import get_current_user
+
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+def get_search_service(
+    search_repo: SearchRepositoryProtocol = Depends(search_repository_dependency),
+    message_repo: MessageRepositoryProtocol = Depends(message_repository_dependency),
+    conversation_repo: ConversationRepositoryProtocol = Depends(conversation_repository_dependency)
+) -> SearchService:
+    """Dependency inject SearchService"""
+    return SearchService(search_repo, message_repo, conversation_repo)
+
+
+@router.get("/messages", response_model=list[MessagePublic])
+async def search_messages(
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    current_user: dict = Depends(get_current_user),
+    service: SearchService = Depends(get_search_service)
+):
+    """
+    API: Tìm kiếm tin nhắn (không phân biệt dấu) trong các hội thoại của user
+    """
+    try:
+        return await service.search_messages(current_user["_id"], q, limit)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel, Field
+
+
+class MessageCreate(BaseModel):
+
+    text: str = Field(min_length=1, max_length=4000)
+
+
+class MessagePublic(BaseModel):
+
+    id: str
+    conversation_id: str
+    sender_id: str
+    recipient_id: str
+    text: str
+    created_at: datetime
+
+
+class ConversationSummary(BaseModel):
+
+    conversation_id: str
+    peer_id: str
+    last_message: Optional[str] = None
+    last_sender_id: Optional[str] = None
+    last_activity: datetime
+    unread_count: int = 0
@@ -1,18 +1,26 @@
-from app.repositories.friend_repository import FriendRepository
-from app.repositories.user_repository import UserRepository
-from datetime import datetime
+import asyncio
+import os
+
+from app.repositories.base import FriendRepositoryProtocol, UserRepositoryProtocol
 from typing import List
-from bson import ObjectId
+
+FRIEND_REQUEST_COMPACTION_INTERVAL_SECONDS = int(os.getenv("FRIEND_REQUEST_COMPACTION_INTERVAL_SECONDS", "3600"))
 
 class FriendService:
-    def __init__(self, friend_repo: FriendRepository, user_repo: UserRepository):
+    def __init__(self, friend_repo: FriendRepositoryProtocol, user_repo: UserRepositoryProtocol):
         self.friend_repo = friend_repo
         self.user_repo = user_repo
 
     async def send_friend_request(self, from_user: str, to_user: str):
+        # kiểm tra mỗi lần: row accepted có thể đã bị TTL/compaction xoá
+        if to_user in await self.friend_repo.list_friends(from_user):
+            return False  # đã là bạn bè
         request = await self.friend_repo.get_friend_request(from_user, to_user)
         if request:
-            return False  # đã gửi rồi
+            if request["status"] == "pending":
+                return False  # đã gửi rồi
+            # row accepted/rejected cũ (đang chờ dọn) không chặn lời mời mới
+            await self.friend_repo.delete_friend_request(request["_id"])
         return await self.friend_repo.create_friend_request(from_user, to_user)
 
     async def accept_friend_request(self, from_user: str, to_user: str):
@@ -25,13 +33,8 @@ class FriendService:
         to_doc = await self.user_repo.get_user_by_id(to_user)
         if not from_doc or not to_doc:
             return False
-        # dùng $addToSet để tránh trùng, và đảm bảo _id là ObjectId
-        await self.user_repo._collection.update_one(
-            {"_id": ObjectId(from_user)}, {"$addToSet": {"friends": to_user}}
-        )
-        await self.user_repo._collection.update_one(
-            {"_id": ObjectId(to_user)}, {"$addToSet": {"friends": from_user}}
-        )
+        await self.user_repo.add_friend(from_user, to_user)
+        await self.user_repo.add_friend(to_user, from_user)
         return True
 
     async def cancel_friend_request(self, from_user: str, to_user: str):
@@ -53,3 +56,17 @@ class FriendService:
         if not u1 or not u2:
             return False
         return await self.friend_repo.unfriend(user_id, friend_id)
+
+
+async def run_friend_request_compaction(friend_repo: FriendRepositoryProtocol, interval_seconds: int = FRIEND_REQUEST_COMPACTION_INTERVAL_SECONDS) -> None:
+    """Task nền: định kỳ compact collection friend_requests (khởi chạy từ lifespan)"""
+    indexes_ready = False
+    while True:
+        try:
+            if not indexes_ready:
+                await friend_repo.ensure_indexes()
+                indexes_ready = True
+            await friend_repo.compact_requests()
+        except Exception as e:
+            print(f"Friend request compaction error: {e}")
+        await asyncio.sleep(interval_seconds)
@@ -0,0 +1,108 @@
+import os
+from typing import AsyncIterator, Optional, Tuple
+
+from fastapi import UploadFile
+
+from app.repositories.friend_repository import FriendRepository
+from app.repositories.media_repository import MediaRepository
+
+
+MEDIA_CHUNK_SIZE = int(os.getenv("MEDIA_CHUNK_SIZE", str(256 * 1024)))
+
+
+def parse_range_header(range_header: Optional[str], length: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse header "Range: bytes=start-end" (chỉ hỗ trợ một đoạn).
+    Trả về None nếu không có Range hoặc Range sai cú pháp / không hỗ trợ (RFC 7233: bỏ qua, trả cả file),
+    raise ValueError nếu đoạn không thể đáp ứng (416).
+    """
+    if not range_header:
+        return None
+    unit, _, spec = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_str, sep, end_str = spec.strip().partition("-")
+    if not sep or not (start_str.isdigit() or start_str == "") or not (end_str.isdigit() or end_str == ""):
+        return None
+    if start_str == "":
+        # bytes=-N: N byte cuối
+        if end_str == "":
+            return None
+        suffix = int(end_str)
+        if suffix == 0 or length == 0:
+            raise ValueError("Range not satisfiable")
+        return max(length - suffix, 0), length - 1
+    start = int(start_str)
+    if end_str and int(end_str) < start:
+        return None
+    if start >= length:
+        raise ValueError("Range not satisfiable")
+    end = int(end_str) if end_str else length - 1
+    return start, min(end, length - 1)
+
+
+class MediaService:
+    """Service layer xử lý upload/download media (GridFS)"""
+
+    def __init__(self, media_repo: MediaRepository, friend_repo: FriendRepository):
+        self.media_repo = media_repo
+        self.friend_repo = friend_repo
+
+    async def upload_media(self, owner_id: str, file: UploadFile) -> dict:
+        """
+        Upload file theo từng chunk vào GridFS
+        - Không đọc toàn bộ file vào bộ nhớ
+        - Nội dung trùng (cùng sha256) dùng lại file cũ
+        """
+        async def chunks() -> AsyncIterator[bytes]:
+            while True:
+                data = await file.read(MEDIA_CHUNK_SIZE)
+                if not data:
+                    break
+                yield data
+
+        media_id = await self.media_repo.upload_stream(
+            filename=file.filename or "upload",
+            content_type=file.content_type,
+            owner_id=owner_id,
+            chunks=chunks(),
+        )
+        media = await self.media_repo.get_file(media_id)
+        return self._to_public(media)
+
+    async def get_media_for_user(self, media_id: str, user_id: str) -> dict:
+        """
+        Lấy metadata của media nếu user có quyền xem
+        - Chủ sở hữu hoặc bạn bè của chủ sở hữu
+        """
+        media = await self.media_repo.get_file(media_id)
+        if not media:
+            raise ValueError("Media not found")
+        owners = media.get("metadata", {}).get("owners", [])
+        if user_id not in owners:
+            friends = await self.friend_repo.list_friends(user_id)
+            if not any(owner in friends for owner in owners):
+                raise PermissionError("Not allowed to access this media")
+        return media
+
+    async def open_media_stream(self, media_id: str, start: int, end: int) -> AsyncIterator[bytes]:
+        """
+        Mở file trước khi gửi response để lỗi (file đã bị xoá, hết deadline)
+        vẫn trả được 404/503 thay vì cắt kết nối sau status 200/206
+        """
+        grid_out = await self.media_repo.open_download(media_id, start)
+        if grid_out is None:
+            raise ValueError("Media not found")
+        return self.media_repo.iter_range(grid_out, end - start + 1, MEDIA_CHUNK_SIZE)
+
+    @staticmethod
+    def _to_public(media: dict) -> dict:
+
+        metadata = media.get("metadata", {})
+        return {
+            "id": media["_id"],
+            "filename": media.get("filename"),
+            "content_type": metadata.get("content_type"),
+            "length": media.get("length"),
+            "sha256": metadata.get("sha256"),
+        }
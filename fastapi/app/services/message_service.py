@@ -0,0 +1,94 @@
+from datetime import datetime
+from typing import List, Optional
+
+from bson import ObjectId
+
+from app.core.deadline import REQUEST_DEADLINE_DEFAULT_MS, deadline_scope
+from app.core.exceptions import DeadlineExceeded
+from app.repositories.base import ConversationRepositoryProtocol, FriendRepositoryProtocol, MessageRepositoryProtocol
+from app.repositories.message_repository import make_conversation_id
+from app.schemas.message import ConversationSummary, MessagePublic
+from app.services.search_service import SearchIndexer
+
+
+class MessageService:
+    """Service layer xử lý tin nhắn 1-1 giữa bạn bè và danh sách hội thoại"""
+
+    def __init__(self, message_repo: MessageRepositoryProtocol, conversation_repo: ConversationRepositoryProtocol, friend_repo: FriendRepositoryProtocol, search_indexer: Optional[SearchIndexer] = None):
+        self.message_repo = message_repo
+        self.conversation_repo = conversation_repo
+        self.friend_repo = friend_repo
+        self.search_indexer = search_indexer
+
+    async def _ensure_friends(self, user_id: str, peer_id: str) -> str:
+        """Chỉ cho phép hội thoại giữa hai người đang là bạn bè"""
+        friends = await self.friend_repo.list_friends(user_id)
+        if peer_id not in friends:
+            raise PermissionError("You can only chat with friends")
+        return make_conversation_id(user_id, peer_id)
+
+    async def send_message(self, sender_id: str, recipient_id: str, text: str) -> MessagePublic:
+        """
+        Gửi tin nhắn
+        - Lưu message
+        - Cập nhật summary hội thoại của hai bên (tin cuối, $inc unread) với budget riêng
+        - Message được lưu với indexed=False, báo cho search indexer
+        """
+        conversation_id = await self._ensure_friends(sender_id, recipient_id)
+        created_at = datetime.utcnow()
+        seq = await self.message_repo.next_seq(conversation_id)
+        message_id = await self.message_repo.create_message(conversation_id, seq, sender_id, recipient_id, text, created_at)
+        # message đã được lưu: summary có budget riêng, không trả 503 (client retry sẽ tạo message trùng)
+        try:
+            with deadline_scope(REQUEST_DEADLINE_DEFAULT_MS, detached=True):
+                await self.conversation_repo.apply_message(conversation_id, sender_id, recipient_id, text, created_at)
+        except DeadlineExceeded as e:
+            print(f"Conversation summary update error: {e}")
+        if self.search_indexer is not None:
+            self.search_indexer.notify()
+        return MessagePublic(
+            id=message_id,
+            conversation_id=conversation_id,
+            sender_id=sender_id,
+            recipient_id=recipient_id,
+            text=text,
+            created_at=created_at
+        )
+
+    async def get_messages(self, user_id: str, peer_id: str, limit: int = 50, before_id: Optional[str] = None) -> List[MessagePublic]:
+
+        if before_id and not ObjectId.is_valid(before_id):
+            raise ValueError("Invalid message id")
+        conversation_id = await self._ensure_friends(user_id, peer_id)
+        messages = await self.message_repo.list_messages(conversation_id, limit, before_id)
+        return [
+            MessagePublic(
+                id=msg["_id"],
+                conversation_id=msg["conversation_id"],
+                sender_id=msg["sender_id"],
+                recipient_id=msg["recipient_id"],
+                text=msg["text"],
+                created_at=msg["created_at"]
+            )
+            for msg in messages
+        ]
+
+    async def get_conversations(self, user_id: str, limit: int = 50) -> List[ConversationSummary]:
+        """Danh sách hội thoại, sắp xếp theo hoạt động gần nhất (một query có index)"""
+        summaries = await self.conversation_repo.list_for_user(user_id, limit)
+        return [
+            ConversationSummary(
+                conversation_id=doc["conversation_id"],
+                peer_id=doc["peer_id"],
+                last_message=doc.get("last_message"),
+                last_sender_id=doc.get("last_sender_id"),
+                last_activity=doc["last_activity"],
+                unread_count=doc.get("unread_count", 0)
+            )
+            for doc in summaries
+        ]
+
+    async def mark_read(self, user_id: str, peer_id: str) -> bool:
+
+        conversation_id = await self._ensure_friends(user_id, peer_id)
+        return await self.conversation_repo.mark_read(user_id, conversation_id, datetime.utcnow())
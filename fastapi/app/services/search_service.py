@@ -0,0 +1,120 @@
+import asyncio
+import os
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from app.repositories.base import ConversationRepositoryProtocol, MessageRepositoryProtocol, SearchRepositoryProtocol
+from app.schemas.message import MessagePublic
+from app.utils.search import tokenize
+
+
+SEARCH_INDEX_BATCH_SIZE = int(os.getenv("SEARCH_INDEX_BATCH_SIZE", "500"))
+SEARCH_INDEX_FLUSH_INTERVAL_SECONDS = float(os.getenv("SEARCH_INDEX_FLUSH_INTERVAL_SECONDS", "1.0"))
+SEARCH_INDEX_COMPACT_EVERY_FLUSHES = int(os.getenv("SEARCH_INDEX_COMPACT_EVERY_FLUSHES", "60"))
+
+
+class SearchIndexer:
+    """
+    Đọc các message chưa được index (indexed=False trong collection messages) theo batch
+    rồi ghi vào inverted index. Hàng đợi nằm trong MongoDB nên không mất khi process dừng;
+    message chỉ được đánh dấu indexed sau khi posting đã ghi xong.
+    """
+
+    def __init__(self, search_repo: SearchRepositoryProtocol, message_repo: MessageRepositoryProtocol, batch_size: int = SEARCH_INDEX_BATCH_SIZE, flush_interval: float = SEARCH_INDEX_FLUSH_INTERVAL_SECONDS):
+        self.search_repo = search_repo
+        self.message_repo = message_repo
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._wakeup = asyncio.Event()
+
+    def notify(self) -> None:
+        """Báo có message mới để indexer chạy sớm thay vì đợi hết flush_interval"""
+        self._wakeup.set()
+
+    async def flush(self) -> int:
+
+        batch = await self.message_repo.list_unindexed(self.batch_size)
+        if not batch:
+            return 0
+        postings: Dict[Tuple[str, str], List[int]] = defaultdict(list)
+        for msg in batch:
+            for term in tokenize(msg.get("text", "")):
+                postings[(term, msg["conversation_id"])].append(msg["seq"])
+        await self.search_repo.add_postings(postings)
+        await self.message_repo.mark_indexed([msg["_id"] for msg in batch])
+        return len(batch)
+
+    async def run(self) -> None:
+
+        ready = False
+        flushes = 0
+        while True:
+            try:
+                if not ready:
+                    await self.search_repo.ensure_indexes()
+                    ready = True
+                # xử lý hết hàng đợi trước khi ngủ
+                while await self.flush() >= self.batch_size:
+                    pass
+                flushes += 1
+                if flushes % SEARCH_INDEX_COMPACT_EVERY_FLUSHES == 0:
+                    await self.search_repo.compact()
+            except Exception as e:
+                print(f"Search indexer error: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+
+_search_indexer: Optional[SearchIndexer] = None
+
+
+def init_search_indexer(search_repo: SearchRepositoryProtocol, message_repo: MessageRepositoryProtocol) -> SearchIndexer:
+
+    global _search_indexer
+    _search_indexer = SearchIndexer(search_repo, message_repo)
+    return _search_indexer
+
+
+def get_search_indexer() -> Optional[SearchIndexer]:
+
+    return _search_indexer
+
+
+class SearchService:
+    """Service layer tìm kiếm tin nhắn trong các hội thoại của user"""
+
+    def __init__(self, search_repo: SearchRepositoryProtocol, message_repo: MessageRepositoryProtocol, conversation_repo: ConversationRepositoryProtocol):
+        self.search_repo = search_repo
+        self.message_repo = message_repo
+        self.conversation_repo = conversation_repo
+
+    async def search_messages(self, user_id: str, query: str, limit: int = 20) -> List[MessagePublic]:
+        """
+        Tìm message chứa tất cả các từ trong query (không phân biệt dấu)
+        - Chỉ trong các hội thoại user tham gia (kể cả với người đã huỷ kết bạn)
+        """
+        terms = sorted(tokenize(query))
+        if not terms:
+            raise ValueError("Query must contain at least one word")
+        conversation_ids = await self.conversation_repo.list_conversation_ids(user_id)
+        if not conversation_ids:
+            return []
+        postings = await self.search_repo.find_postings(terms, conversation_ids)
+
+        messages = await self.message_repo.get_messages_by_seqs(
+            {conversation_id: seqs[:limit] for conversation_id, seqs in postings.items()}, limit
+        )
+        return [
+            MessagePublic(
+                id=msg["_id"],
+                conversation_id=msg["conversation_id"],
+                sender_id=msg["sender_id"],
+                recipient_id=msg["recipient_id"],
+                text=msg["text"],
+                created_at=msg["created_at"]
+            )
+            for msg in messages
+        ]
@@ -1,6 +1,6 @@
 from typing import List, Optional
 
-from app.repositories.user_repository import UserRepository
+from app.repositories.base import UserRepositoryProtocol
 from app.schemas.user import UserPublic
 from app.utils.security import hash_password, verify_password
 
@@ -8,7 +8,7 @@ from app.utils.security import hash_password, verify_password
 class UserService:
     """Service layer xử lý logic nghiệp vụ cho User"""
 
-    def __init__(self, user_repository: UserRepository):
+    def __init__(self, user_repository: UserRepositoryProtocol):
         self.user_repository = user_repository
 
     async def register_user(self, email: str, password: str, full_name: Optional[str], role: str = "user") -> UserPublic:
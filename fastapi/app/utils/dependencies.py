@@ -1,8 +1,8 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
-from app.database.connection import mongo_db_dependency
-from app.repositories.user_repository import UserRepository
+from app.repositories.base import UserRepositoryProtocol
+from app.repositories.factory import user_repository_dependency
 from app.utils.security import decode_access_token
 
 
@@ -11,7 +11,7 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db = Depends(mongo_db_dependency)
+    user_repo: UserRepositoryProtocol = Depends(user_repository_dependency)
 ) -> dict:
     """
     Dependency: Lấy thông tin user hiện tại từ token
@@ -31,7 +31,6 @@ async def get_current_user(
         )
     
     # Lấy user từ DB
-    user_repo = UserRepository(db)
     user = await user_repo.get_user_by_id(user_id)
     
     if not user:
@@ -0,0 +1,48 @@
+import re
+import unicodedata
+from typing import Iterable, List, Set
+
+
+_TOKEN_RE = re.compile(r"\w+")
+MAX_TOKEN_LENGTH = 64
+
+
+def normalize_text(text: str) -> str:
+    """Bỏ dấu tiếng Việt (NFD + bỏ combining mark, đ -> d) và chuyển về chữ thường"""
+    decomposed = unicodedata.normalize("NFD", text.lower())
+    stripped = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return stripped.replace("đ", "d")
+
+
+def tokenize(text: str) -> Set[str]:
+
+    return {token[:MAX_TOKEN_LENGTH] for token in _TOKEN_RE.findall(normalize_text(text))}
+
+
+def encode_postings(seqs: Iterable[int]) -> bytes:
+    """Posting list: các seq tăng dần, mã hoá delta + varint"""
+    out = bytearray()
+    previous = 0
+    for seq in sorted(seqs):
+        delta = seq - previous
+        previous = seq
+        while delta >= 0x80:
+            out.append((delta & 0x7F) | 0x80)
+            delta >>= 7
+        out.append(delta)
+    return bytes(out)
+
+
+def decode_postings(data: bytes) -> List[int]:
+
+    seqs = []
+    value = shift = previous = 0
+    for byte in data:
+        value |= (byte & 0x7F) << shift
+        if byte & 0x80:
+            shift += 7
+            continue
+        previous += value
+        seqs.append(previous)
+        value = shift = 0
+    return seqs
@@ -0,0 +1,113 @@
+"""
+Benchmark: danh sách hội thoại từ collection summary "conversations"
+so với aggregation trực tiếp trên "messages" (tin cuối + số tin chưa đọc).
+
+Dùng một database riêng (mặc định fastapi_bench), seed dữ liệu giả rồi đo:
+    python benchmarks/bench_conversations.py --users 200 --messages 200000 --runs 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.connection import _get_mongo_uri  # noqa: E402
+from app.repositories.conversation_repository import ConversationRepository  # noqa: E402
+from app.repositories.message_repository import MessageRepository, make_conversation_id  # noqa: E402
+
+
+async def seed(db, users: int, messages: int) -> list:
+    await db.drop_collection("messages")
+    await db.drop_collection("conversations")
+    message_repo = MessageRepository(db)
+    conversation_repo = ConversationRepository(db)
+    await message_repo.ensure_indexes()
+    await conversation_repo.ensure_indexes()
+    # index cho cả hai nhánh $or của aggregation baseline
+    await db.messages.create_index([("sender_id", 1), ("created_at", -1)])
+    await db.messages.create_index([("recipient_id", 1), ("created_at", -1)])
+
+    user_ids = [f"user{i:05d}" for i in range(users)]
+    start = datetime.utcnow() - timedelta(days=30)
+    batch = []
+    for i in range(messages):
+        sender, recipient = random.sample(user_ids, 2)
+        created_at = start + timedelta(seconds=i)
+        conversation_id = make_conversation_id(sender, recipient)
+        batch.append({
+            "conversation_id": conversation_id,
+            "sender_id": sender,
+            "recipient_id": recipient,
+            "text": f"message {i}",
+            "created_at": created_at,
+        })
+        await conversation_repo.apply_message(conversation_id, sender, recipient, f"message {i}", created_at)
+        if len(batch) >= 5000:
+            await db.messages.insert_many(batch)
+            batch = []
+    if batch:
+        await db.messages.insert_many(batch)
+    return user_ids
+
+
+def aggregation_pipeline(user_id: str) -> list:
+    return [
+        {"$match": {"$or": [{"sender_id": user_id}, {"recipient_id": user_id}]}},
+        {"$sort": {"created_at": -1}},
+        {"$group": {
+            "_id": "$conversation_id",
+            "last_message": {"$first": "$text"},
+            "last_activity": {"$first": "$created_at"},
+            "unread_count": {"$sum": {"$cond": [{"$eq": ["$recipient_id", user_id]}, 1, 0]}},
+        }},
+        {"$sort": {"last_activity": -1}},
+        {"$limit": 50},
+    ]
+
+
+async def measure(label: str, fn, user_ids: list, runs: int) -> None:
+    timings = []
+    for _ in range(runs):
+        user_id = random.choice(user_ids)
+        started = time.perf_counter()
+        await fn(user_id)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<12} mean={statistics.mean(timings):7.2f}ms  p50={statistics.median(timings):7.2f}ms  p95={p95:7.2f}ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default="fastapi_bench")
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(_get_mongo_uri())
+    db = client[args.db]
+    user_ids = await seed(db, args.users, args.messages)
+    conversation_repo = ConversationRepository(db)
+
+    async def summary(user_id: str):
+        return await conversation_repo.list_for_user(user_id, 50)
+
+    async def aggregate(user_id: str):
+        return await db.messages.aggregate(aggregation_pipeline(user_id)).to_list(None)
+
+    print(f"users={args.users} messages={args.messages} runs={args.runs}")
+    await measure("summary", summary, user_ids, args.runs)
+    await measure("aggregation", aggregate, user_ids, args.runs)
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""
+Benchmark: chi phí CPU của từng endpoint (framework + auth + serialization) khi không có MongoDB.
+Chạy toàn bộ router stack in-process với STORAGE_BACKEND=memory qua httpx.ASGITransport.
+
+    python benchmarks/bench_endpoints.py --iterations 500
+
+Lưu ý: /auth/register và /auth/login bị chi phối bởi bcrypt nên dùng ít vòng hơn (--hash-iterations).
+Media (GridFS) không có bản in-memory nên không được mount và không nằm trong benchmark này.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+os.environ["STORAGE_BACKEND"] = "memory"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+from app.database.memory import get_memory_store  # noqa: E402
+from app.main import app  # noqa: E402
+from app.repositories.factory import make_message_repository, make_search_repository  # noqa: E402
+from app.services.search_service import init_search_indexer  # noqa: E402
+from app.utils.security import create_access_token, hash_password  # noqa: E402
+
+
+RESULTS = []
+
+
+async def measure(label: str, calls) -> None:
+    """calls: list các coroutine factory, mỗi cái thực hiện một request"""
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    for call in calls:
+        response = await call()
+        if response.status_code >= 400:
+            raise RuntimeError(f"{label}: {response.status_code} {response.text}")
+    wall = time.perf_counter() - wall_started
+    cpu = time.process_time() - cpu_started
+    RESULTS.append((label, len(calls), cpu / len(calls) * 1e6, wall / len(calls) * 1e6))
+
+
+def seed_users(count: int, prefix: str, role: str = "user") -> list:
+    """Mỗi lần gọi dùng prefix riêng để email không trùng (users.email là unique)"""
+    store = get_memory_store()
+    hashed = hash_password("secret123")
+    ids = [
+        store.users.insert({"email": f"{prefix}{i}@example.com", "hashed_password": hashed, "full_name": f"{prefix} {i}", "role": role})
+        for i in range(count)
+    ]
+    return [(user_id, {"Authorization": f"Bearer {create_access_token(user_id)}"}) for user_id in ids]
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--hash-iterations", type=int, default=20)
+    args = parser.parse_args()
+    n = args.iterations
+
+    # ASGITransport không chạy lifespan: tự khởi tạo search indexer và flush thủ công
+    indexer = init_search_indexer(make_search_repository(), make_message_repository())
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        (owner_id, owner), = seed_users(1, "owner")
+        (_, admin), = seed_users(1, "admin", role="admin")
+        peers = seed_users(n, "peer")
+
+        await measure("GET /", [lambda: client.get("/")] * n)
+        await measure("POST /auth/seed-test-user", [lambda: client.post("/auth/seed-test-user")] * n)
+        await measure("POST /auth/seed-admin", [lambda: client.post("/auth/seed-admin")] * n)
+        await measure("POST /auth/register", [
+            (lambda i=i: client.post("/auth/register", json={"email": f"new{i}@example.com", "password": "secret123"}))
+            for i in range(args.hash_iterations)
+        ])
+        await measure("POST /auth/login", [
+            lambda: client.post("/auth/login", data={"username": "owner0@example.com", "password": "secret123"})
+        ] * args.hash_iterations)
+        await measure("GET /admin/users", [lambda: client.get("/admin/users", headers=admin)] * n)
+        await measure("GET /admin/metrics/timeouts", [lambda: client.get("/admin/metrics/timeouts", headers=admin)] * n)
+
+        await measure("POST /friends/request/{id}", [
+            (lambda peer_id=peer_id: client.post(f"/friends/request/{peer_id}", headers=owner))
+            for peer_id, _ in peers
+        ])
+        await measure("GET /friends/requests", [
+            (lambda headers=headers: client.get("/friends/requests", headers=headers))
+            for _, headers in peers
+        ])
+        await measure("POST /friends/accept/{id}", [
+            (lambda headers=headers: client.post(f"/friends/accept/{owner_id}", headers=headers))
+            for _, headers in peers
+        ])
+        await measure("GET /friends/list", [lambda: client.get("/friends/list", headers=owner)] * n)
+
+        await measure("POST /conversations/{id}/messages", [
+            (lambda i=i, peer_id=peer_id: client.post(
+                f"/conversations/{peer_id}/messages", headers=owner, json={"text": f"Xin chào bạn, hẹn gặp ở Hà Nội lúc {i} giờ"}
+            ))
+            for i, (peer_id, _) in enumerate(peers)
+        ])
+        await measure("GET /conversations", [lambda: client.get("/conversations", headers=owner)] * n)
+        await measure("GET /conversations/{id}/messages", [
+            (lambda peer_id=peer_id: client.get(f"/conversations/{peer_id}/messages", headers=owner))
+            for peer_id, _ in peers
+        ])
+        await measure("POST /conversations/{id}/read", [
+            (lambda headers=headers: client.post(f"/conversations/{owner_id}/read", headers=headers))
+            for _, headers in peers
+        ])
+        while await indexer.flush():
+            pass
+        await measure("GET /search/messages", [
+            lambda: client.get("/search/messages", params={"q": "ha noi", "limit": 20}, headers=owner)
+        ] * n)
+        await measure("DELETE /friends/{id}", [
+            (lambda peer_id=peer_id: client.delete(f"/friends/{peer_id}", headers=owner))
+            for peer_id, _ in peers
+        ])
+        # gửi lại lời mời (row accepted cũ không chặn, không tính giờ) rồi đo thao tác huỷ
+        for peer_id, _ in peers:
+            await client.post(f"/friends/request/{peer_id}", headers=owner)
+        await measure("DELETE /friends/request/{id}", [
+            (lambda peer_id=peer_id: client.delete(f"/friends/request/{peer_id}", headers=owner))
+            for peer_id, _ in peers
+        ])
+        await measure("DELETE /admin/users/{id}", [
+            (lambda peer_id=peer_id: client.delete(f"/admin/users/{peer_id}", headers=admin))
+            for peer_id, _ in peers
+        ])
+
+    print(f"{'endpoint':<36}{'requests':>10}{'cpu us/req':>14}{'wall us/req':>14}")
+    for label, count, cpu_us, wall_us in RESULTS:
+        print(f"{label:<36}{count:>10}{cpu_us:>14.1f}{wall_us:>14.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
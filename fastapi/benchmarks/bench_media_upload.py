@@ -0,0 +1,89 @@
+"""
+Benchmark: upload song song nhiều file lớn lên POST /media và đo peak RSS của server.
+
+Chạy server trước (uvicorn app.main:app), rồi:
+    python benchmarks/bench_media_upload.py --pid <PID_UVICORN> --token <JWT> --size-mb 1024 --concurrency 4
+
+Yêu cầu: httpx, psutil. Dữ liệu upload được sinh theo từng chunk nên client cũng không giữ cả file.
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import httpx
+import psutil
+
+
+CHUNK = 1024 * 1024
+
+
+async def _body(size_bytes: int, boundary: str, filename: str):
+    yield (
+        f"--{boundary}\r\n"
+        f'Content-Disposition: form-data; name="file"; filename="{filename}"\r\n'
+        "Content-Type: application/octet-stream\r\n\r\n"
+    ).encode()
+    sent = 0
+    # Mỗi file có nội dung khác nhau để không bị dedupe
+    block = os.urandom(CHUNK)
+    while sent < size_bytes:
+        n = min(CHUNK, size_bytes - sent)
+        yield block[:n]
+        sent += n
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+
+async def _upload(client: httpx.AsyncClient, url: str, token: str, size_bytes: int, index: int) -> float:
+    boundary = f"bench-boundary-{index}"
+    started = time.perf_counter()
+    response = await client.post(
+        url,
+        content=_body(size_bytes, boundary, f"bench-{index}.bin"),
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Content-Type": f"multipart/form-data; boundary={boundary}",
+        },
+    )
+    response.raise_for_status()
+    return time.perf_counter() - started
+
+
+async def _sample_rss(process: psutil.Process, stop: asyncio.Event, samples: list) -> None:
+    while not stop.is_set():
+        samples.append(process.memory_info().rss)
+        await asyncio.sleep(0.2)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default="http://localhost:8000/media")
+    parser.add_argument("--token", required=True)
+    parser.add_argument("--pid", type=int, required=True, help="PID của process uvicorn")
+    parser.add_argument("--size-mb", type=int, default=1024)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    process = psutil.Process(args.pid)
+    baseline = process.memory_info().rss
+    samples: list = []
+    stop = asyncio.Event()
+    sampler = asyncio.create_task(_sample_rss(process, stop, samples))
+
+    async with httpx.AsyncClient(timeout=None) as client:
+        durations = await asyncio.gather(*[
+            _upload(client, args.url, args.token, args.size_mb * 1024 * 1024, i)
+            for i in range(args.concurrency)
+        ])
+    stop.set()
+    await sampler
+
+    peak = max(samples or [baseline])
+    total_mb = args.size_mb * args.concurrency
+    print(f"uploads: {args.concurrency} x {args.size_mb} MB")
+    print(f"wall time (max): {max(durations):.1f}s, throughput: {total_mb / max(durations):.1f} MB/s")
+    print(f"server RSS baseline: {baseline / 2**20:.1f} MB, peak: {peak / 2**20:.1f} MB, delta: {(peak - baseline) / 2**20:.1f} MB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,130 @@
+"""
+Benchmark: tìm kiếm tin nhắn bằng inverted index (search_index) so với Mongo $text index.
+Đo latency query và kích thước index trên một database riêng (mặc định fastapi_bench).
+
+    python benchmarks/bench_search.py --users 100 --messages 200000 --runs 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database.connection import _get_mongo_uri  # noqa: E402
+from app.repositories.message_repository import MessageRepository, make_conversation_id  # noqa: E402
+from app.repositories.search_repository import SearchRepository  # noqa: E402
+from app.services.search_service import SearchIndexer  # noqa: E402
+from app.utils.search import tokenize  # noqa: E402
+
+
+WORDS = (
+    "xin chào bạn khỏe không hôm nay trời đẹp quá đi ăn phở bún chả cà phê sữa đá "
+    "tối nay mình gặp nhau ở đâu nhé được rồi cảm ơn nhiều hẹn gặp lại Hà Nội Sài Gòn "
+    "Đà Nẵng công việc học tập gia đình cuối tuần du lịch biển núi phim nhạc sách"
+).split()
+
+
+async def seed(db, users: int, messages: int) -> dict:
+    await db.drop_collection("messages")
+    await db.drop_collection("search_index")
+    message_repo = MessageRepository(db)
+    search_repo = SearchRepository(db)
+    await message_repo.ensure_indexes()
+    await search_repo.ensure_indexes()
+    indexer = SearchIndexer(search_repo, message_repo, batch_size=5000)
+
+    user_ids = [f"user{i:05d}" for i in range(users)]
+    conversations = {}
+    seqs: dict = {}
+    start = datetime.utcnow() - timedelta(days=30)
+    batch = []
+    for i in range(messages):
+        sender, recipient = random.sample(user_ids, 2)
+        conversation_id = make_conversation_id(sender, recipient)
+        conversations.setdefault(sender, set()).add(conversation_id)
+        conversations.setdefault(recipient, set()).add(conversation_id)
+        seq = seqs[conversation_id] = seqs.get(conversation_id, 0) + 1
+        text = " ".join(random.choices(WORDS, k=random.randint(3, 15)))
+        batch.append({
+            "conversation_id": conversation_id,
+            "seq": seq,
+            "sender_id": sender,
+            "recipient_id": recipient,
+            "text": text,
+            "created_at": start + timedelta(seconds=i),
+            "indexed": False,
+        })
+        if len(batch) >= 5000:
+            await db.messages.insert_many(batch)
+            await indexer.flush()
+            batch = []
+    if batch:
+        await db.messages.insert_many(batch)
+    while await indexer.flush():
+        pass
+    while await search_repo.compact():
+        pass
+    await db.messages.create_index([("text", "text")], default_language="none", name="text_text")
+    return {user: sorted(ids) for user, ids in conversations.items()}
+
+
+async def measure(label: str, fn, users: dict, runs: int) -> None:
+    timings = []
+    for _ in range(runs):
+        user_id = random.choice(list(users))
+        query = " ".join(random.sample(WORDS, 2))
+        started = time.perf_counter()
+        await fn(users[user_id], query)
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<14} mean={statistics.mean(timings):7.2f}ms  p50={statistics.median(timings):7.2f}ms  p95={p95:7.2f}ms")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default="fastapi_bench")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    client = AsyncIOMotorClient(_get_mongo_uri())
+    db = client[args.db]
+    users = await seed(db, args.users, args.messages)
+    search_repo = SearchRepository(db)
+    message_repo = MessageRepository(db)
+
+    async def inverted(conversation_ids, query):
+        postings = await search_repo.find_postings(sorted(tokenize(query)), conversation_ids)
+        return await message_repo.get_messages_by_seqs(
+            {conversation_id: seqs[:20] for conversation_id, seqs in postings.items()}, 20
+        )
+
+    async def text_index(conversation_ids, query):
+        phrase = " ".join(f'"{word}"' for word in query.split())
+        cursor = db.messages.find(
+            {"$text": {"$search": phrase}, "conversation_id": {"$in": conversation_ids}}
+        ).sort("created_at", -1).limit(20)
+        return await cursor.to_list(None)
+
+    print(f"users={args.users} messages={args.messages} runs={args.runs}")
+    await measure("inverted index", inverted, users, args.runs)
+    await measure("$text", text_index, users, args.runs)
+
+    search_stats = await db.command("collStats", "search_index")
+    message_stats = await db.command("collStats", "messages")
+    print(f"search_index size: data={search_stats['size'] / 2**20:.1f} MB, storage={search_stats['storageSize'] / 2**20:.1f} MB, indexes={search_stats['totalIndexSize'] / 2**20:.1f} MB")
+    print(f"$text index size: {message_stats['indexSizes'].get('text_text', 0) / 2**20:.1f} MB")
+    client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())